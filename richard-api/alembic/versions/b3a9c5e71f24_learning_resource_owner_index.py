@@ -0,0 +1,32 @@
+"""learning resource owner index
+
+Revision ID: b3a9c5e71f24
+Revises: 7637c06093bd
+Create Date: 2026-08-30 10:12:45.118236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3a9c5e71f24'
+down_revision: Union[str, Sequence[str], None] = '7637c06093bd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_learning_resources_user_id_id',
+        'learning_resources',
+        ['user_id', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_learning_resources_user_id_id', table_name='learning_resources')
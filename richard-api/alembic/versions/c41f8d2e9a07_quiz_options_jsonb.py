@@ -0,0 +1,38 @@
+"""quiz options jsonb
+
+Revision ID: c41f8d2e9a07
+Revises: b3a9c5e71f24
+Create Date: 2026-08-30 14:02:11.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f8d2e9a07'
+down_revision: Union[str, Sequence[str], None] = 'b3a9c5e71f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Convert the newline-joined options string into a JSONB array in place
+    op.execute(
+        "ALTER TABLE multiple_choice_questions "
+        "ALTER COLUMN options TYPE JSONB "
+        "USING to_jsonb(string_to_array(options, E'\\n'))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "ALTER TABLE multiple_choice_questions "
+        "ALTER COLUMN options TYPE TEXT "
+        "USING array_to_string("
+        "ARRAY(SELECT jsonb_array_elements_text(options)), E'\\n')"
+    )
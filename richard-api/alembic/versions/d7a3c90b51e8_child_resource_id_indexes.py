@@ -0,0 +1,41 @@
+"""child resource_id indexes
+
+Revision ID: d7a3c90b51e8
+Revises: c41f8d2e9a07
+Create Date: 2026-08-30 15:21:07.884120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3c90b51e8'
+down_revision: Union[str, Sequence[str], None] = 'c41f8d2e9a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_flash_cards_resource_id',
+        'flash_cards',
+        ['resource_id'],
+    )
+    op.create_index(
+        'ix_multiple_choice_questions_resource_id',
+        'multiple_choice_questions',
+        ['resource_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_multiple_choice_questions_resource_id',
+        table_name='multiple_choice_questions',
+    )
+    op.drop_index('ix_flash_cards_resource_id', table_name='flash_cards')
@@ -0,0 +1,60 @@
+"""folder materialized path
+
+Revision ID: e9b61f47a2c3
+Revises: d7a3c90b51e8
+Create Date: 2026-08-30 18:42:31.507218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b61f47a2c3'
+down_revision: Union[str, Sequence[str], None] = 'd7a3c90b51e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'resource_folders',
+        sa.Column('materialized_path', sa.Text(), nullable=True),
+    )
+    # Backfill every folder's ancestor chain in one recursive pass
+    op.execute(
+        """
+        WITH RECURSIVE paths AS (
+            SELECT id, '/' || id || '/' AS path
+            FROM resource_folders
+            WHERE parent_folder_id IS NULL
+            UNION ALL
+            SELECT f.id, p.path || f.id || '/'
+            FROM resource_folders f
+            JOIN paths p ON f.parent_folder_id = p.id
+        )
+        UPDATE resource_folders
+        SET materialized_path = paths.path
+        FROM paths
+        WHERE resource_folders.id = paths.id
+        """
+    )
+    # text_pattern_ops so LIKE '/1/5/%' prefix matches can use the index
+    op.create_index(
+        'ix_resource_folders_materialized_path',
+        'resource_folders',
+        ['materialized_path'],
+        postgresql_ops={'materialized_path': 'text_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_resource_folders_materialized_path',
+        table_name='resource_folders',
+    )
+    op.drop_column('resource_folders', 'materialized_path')
@@ -0,0 +1,51 @@
+"""resource image_urls
+
+Revision ID: f3a8d5c12e6b
+Revises: e9b61f47a2c3
+Create Date: 2026-08-30 19:08:14.226950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d5c12e6b'
+down_revision: Union[str, Sequence[str], None] = 'e9b61f47a2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'learning_resources',
+        sa.Column(
+            'image_urls',
+            JSONB(),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+    )
+    # Backfill from the image table, preserving upload order
+    op.execute(
+        """
+        UPDATE learning_resources r
+        SET image_urls = sub.urls
+        FROM (
+            SELECT resource_id,
+                   jsonb_agg(image_url ORDER BY created_at) AS urls
+            FROM learning_resource_images
+            GROUP BY resource_id
+        ) sub
+        WHERE r.id = sub.resource_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('learning_resources', 'image_urls')
@@ -4,10 +4,31 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.users.models import User
 from app.users.services.auth_service import AuthService
+from collections import OrderedDict
+import threading
+import time
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Short-TTL cache of token -> User so hot endpoints skip the JWT decode
+# and users-table SELECT on every request. Keyed on the full signed token:
+# a token that doesn't verify can never have been inserted, so a cache hit
+# implies a previously verified credential. The TTL bounds how long a
+# deleted or changed account can keep authenticating from the cache.
+_USER_CACHE_TTL_SECONDS = 30
+_USER_CACHE_MAX_ENTRIES = 10_000
+_user_cache: OrderedDict = OrderedDict()
+# This dependency runs sync (threadpool), so cache access needs a real lock
+_user_cache_lock = threading.Lock()
+
+
+def invalidate_user_token(token: str) -> None:
+    """Drop a token's cached user, e.g. right after account deletion."""
+    with _user_cache_lock:
+        _user_cache.pop(token, None)
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -25,10 +46,29 @@ def get_current_user(
     try:
         # Extract token from credentials
         token = credentials.credentials
-        
+
+        now = time.monotonic()
+        with _user_cache_lock:
+            entry = _user_cache.get(token)
+            if entry is not None:
+                expires_at, cached_user = entry
+                if expires_at > now:
+                    _user_cache.move_to_end(token)
+                    return cached_user
+                del _user_cache[token]
+
         # Get user from token
         user = auth_service.get_user_from_token(token)
-        
+
+        # The cached instance is detached from its session by the time a
+        # later request reads it; all User columns are plain (no deferred
+        # loads), so attribute access stays safe
+        with _user_cache_lock:
+            _user_cache[token] = (now + _USER_CACHE_TTL_SECONDS, user)
+            _user_cache.move_to_end(token)
+            while len(_user_cache) > _USER_CACHE_MAX_ENTRIES:
+                _user_cache.popitem(last=False)
+
         return user
         
     except Exception as e:
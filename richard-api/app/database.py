@@ -8,14 +8,25 @@ from sqlalchemy.pool import QueuePool
 engine = create_engine(
     settings.database_url,
     poolclass=QueuePool,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,  # Validates connections before use
-    pool_recycle=300,  # Recycle connections every 5 minutes
+    # Sized for API-server load: enough warm connections that request
+    # bursts don't queue on checkout, with overflow as the escape valve
+    pool_size=20,
+    max_overflow=40,
+    # No pre-ping: it costs a round-trip per checkout. TCP keepalives
+    # below detect dead peers instead, and pool_recycle retires
+    # connections before the server/PgBouncer would drop them
+    pool_pre_ping=False,
+    pool_recycle=1800,  # Recycle connections every 30 minutes
     connect_args=(
         {
             "options": "-c timezone=utc",
             "sslmode": "require" if "sslmode" not in settings.database_url else None,
+            # Keepalives surface silently dropped connections (NAT/LB
+            # timeouts) without the per-checkout ping round-trip
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
         }
         if settings.database_url and "postgresql" in settings.database_url
         else {}
@@ -23,7 +34,11 @@ engine = create_engine(
 )
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps attributes loaded at flush time (via
+# INSERT ... RETURNING) readable after commit without a reload SELECT
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 # Create Base class for models
 Base = declarative_base()
@@ -1,8 +1,8 @@
 from pydantic import BaseModel
 from app.learning.models import LearningResource, FlashCard
 from app.database import get_db
-from sqlalchemy.orm import Session
-from openai import OpenAI
+from sqlalchemy.orm import Session, undefer
+from app.openai_client import get_openai_client
 from typing import List
 import logging
 import json
@@ -54,7 +54,9 @@ def generate_flash_cards(resource_id: int):
     db = next(get_db())
     
     try:
-        resource = db.query(LearningResource).filter(LearningResource.id == resource_id).first()
+        resource = db.query(LearningResource).options(
+            undefer(LearningResource.transcript)
+        ).filter(LearningResource.id == resource_id).first()
         if not resource:
             raise Exception(f"Resource not found: {resource_id}")
 
@@ -65,8 +67,8 @@ def generate_flash_cards(resource_id: int):
             logger.warning(f"No transcript available for resource {resource_id}, cannot generate flash cards")
             return
 
-        # Initialize OpenAI client
-        client = OpenAI()
+        # Shared OpenAI client (pooled connections, process-wide)
+        client = get_openai_client()
         
         # Generate flash cards using GPT
         response = client.chat.completions.create(
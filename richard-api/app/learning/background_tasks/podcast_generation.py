@@ -1,6 +1,6 @@
-from openai import OpenAI
+from app.openai_client import get_openai_client
 from app.learning.models import LearningResource, Podcast, ResourceStatus
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 import logging
 from app.database import get_db # Added for db session management
 
@@ -31,7 +31,9 @@ def generate_podcast_script(resource_id: int):
     """
     db = next(get_db())
     try:
-        resource = db.query(LearningResource).filter(LearningResource.id == resource_id).first()
+        resource = db.query(LearningResource).options(
+            undefer(LearningResource.transcript)
+        ).filter(LearningResource.id == resource_id).first()
         if not resource:
             logger.error(f"Resource not found: {resource_id}")
             return
@@ -45,7 +47,7 @@ def generate_podcast_script(resource_id: int):
 
         logger.info(f"Generating podcast script for resource {resource_id}")
         
-        client = OpenAI()
+        client = get_openai_client()
         
         response = client.chat.completions.create(
             model="gpt-4", # Using gpt-4 for potentially better script generation
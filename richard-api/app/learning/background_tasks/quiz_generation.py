@@ -1,8 +1,8 @@
 from pydantic import BaseModel
 from app.learning.models import LearningResource, MultipleChoiceQuestion
 from app.database import get_db
-from sqlalchemy.orm import Session
-from openai import OpenAI
+from sqlalchemy.orm import Session, undefer
+from app.openai_client import get_openai_client
 from typing import List
 import logging
 import json
@@ -61,7 +61,9 @@ def generate_quiz_questions(resource_id: int):
     db = next(get_db())
     
     try:
-        resource = db.query(LearningResource).filter(LearningResource.id == resource_id).first()
+        resource = db.query(LearningResource).options(
+            undefer(LearningResource.transcript)
+        ).filter(LearningResource.id == resource_id).first()
         if not resource:
             raise Exception(f"Resource not found: {resource_id}")
 
@@ -72,8 +74,8 @@ def generate_quiz_questions(resource_id: int):
             logger.warning(f"No transcript available for resource {resource_id}, cannot generate quiz questions")
             return
 
-        # Initialize OpenAI client
-        client = OpenAI()
+        # Shared OpenAI client (pooled connections, process-wide)
+        client = get_openai_client()
         
         # Generate quiz questions using GPT
         response = client.chat.completions.create(
@@ -124,14 +126,11 @@ def generate_quiz_questions(resource_id: int):
                     logger.warning(f"Skipping question where correct_option is not in options: {question_data}")
                     continue
                 
-                # Convert options list to newline-separated string for database storage
-                options_string = "\n".join(options)
-                
                 quiz_question = MultipleChoiceQuestion(
                     user_id=resource.user_id,
                     resource_id=resource.id,
                     question=question_data['question'].strip(),
-                    options=options_string,
+                    options=options,
                     correct_option=correct_option.strip()
                 )
                 
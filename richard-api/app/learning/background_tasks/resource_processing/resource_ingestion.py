@@ -1,14 +1,29 @@
 from app.learning.models import LearningResource, LearningResourceFileType, ResourceStatus
 from app.database import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from fastapi import Depends
 
 import re
 import logging
+from datetime import timedelta
 from app.learning.background_tasks.resource_processing.resource_transcription import RESOURCE_TYPE_TO_TRANSCRIBE_FUNCTION
 from app.learning.background_tasks.resource_processing.resource_summary import RESOURCE_TYPE_TO_GEN_TITLE_FUNCTION, summarize_text
+from app.task_queue import enqueue
+from sqlalchemy import func, select, update
+from fastapi import HTTPException
 logger = logging.getLogger(__name__)
 
+# How long a resource may sit in a non-terminal status before the startup
+# sweep considers its worker dead and requeues it. Generous so a freshly
+# booted process doesn't steal work another process started moments ago.
+_STUCK_RESOURCE_AGE = timedelta(minutes=10)
+
+# At most this many rows are claimed per sweep - well under the task
+# queue's back-pressure limit, so a deep backlog can never fail the
+# startup hook. Anything left over stays stuck-aged and is picked up by
+# a later sweep.
+_RECOVERY_BATCH_LIMIT = 32
+
 
 
 def save_resource_status(resource: LearningResource, status: ResourceStatus, db: Session = None):
@@ -18,6 +33,69 @@ def save_resource_status(resource: LearningResource, status: ResourceStatus, db:
 
 
 
+def recover_stuck_resources():
+    """
+    Requeue resources abandoned mid-ingest by a previous process.
+
+    Ingestion runs on an in-process queue, so a crash or redeploy between
+    committing a resource and finishing its background work leaves the
+    row parked in a non-terminal status forever. Sweeping those back into
+    the queue at startup closes that window; the age cutoff keeps a
+    restarting worker from grabbing jobs a live sibling is still running.
+
+    Every uvicorn worker runs this hook at boot, so rows are claimed
+    atomically: the UPDATE bumps updated_at under the same stuck-age
+    predicate, and whichever worker commits first takes the row while
+    the others see it as freshly touched and skip it. Each stuck
+    resource is therefore requeued exactly once per fleet restart.
+    """
+    stuck = (
+        LearningResource.status.in_([
+            ResourceStatus.PROCESSING.value,
+            ResourceStatus.TRANSCRIBING.value,
+            ResourceStatus.SUMMARIZING.value,
+        ]),
+        LearningResource.updated_at < func.now() - _STUCK_RESOURCE_AGE,
+    )
+    claim = (
+        update(LearningResource)
+        .where(
+            LearningResource.id.in_(
+                select(LearningResource.id)
+                .where(*stuck)
+                .limit(_RECOVERY_BATCH_LIMIT)
+            ),
+            # Repeated in the outer WHERE so the row recheck after a lock
+            # wait (READ COMMITTED) sees the winner's updated_at bump and
+            # drops the row from the loser's claim
+            *stuck,
+        )
+        .values(updated_at=func.now())
+        .returning(LearningResource.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    db = next(get_db())
+    try:
+        resource_ids = [row[0] for row in db.execute(claim)]
+        db.commit()
+    finally:
+        db.close()
+
+    for resource_id in resource_ids:
+        logger.info(f"Requeueing stuck resource {resource_id}")
+        try:
+            enqueue(ingest_resource, resource_id)
+        except HTTPException:
+            # Queue full - leave the rest for a later sweep rather than
+            # failing the startup hook
+            logger.warning(
+                f"Task queue full, deferring recovery of resource {resource_id} "
+                f"and later"
+            )
+            break
+
+
 def ingest_resource(resource_id: int):
     """
     Process a learning resource by transcribing/extracting content and updating status.
@@ -32,7 +110,10 @@ def ingest_resource(resource_id: int):
     db = next(get_db())
     
     try:
-        resource = db.query(LearningResource).filter(LearningResource.id == resource_id).first()
+        # Transcription/summarization read the transcript, so load it up front
+        resource = db.query(LearningResource).options(
+            undefer(LearningResource.transcript)
+        ).filter(LearningResource.id == resource_id).first()
         if not resource:
             raise Exception(f"Resource not found: {resource_id}")
 
@@ -1,4 +1,4 @@
-from openai import OpenAI
+from app.openai_client import get_openai_client
 from app.learning.models import LearningResource, LearningResourceFileType
 from sqlalchemy.orm import Session
 import re
@@ -70,8 +70,8 @@ def generate_resource_title(resource: LearningResource, db: Session = None):
             if last_sentence_end > 750:  # Ensure we have meaningful content
                 summary_sample = summary_sample[:last_sentence_end + 1]
         
-        # Initialize OpenAI client
-        client = OpenAI()
+        # Shared OpenAI client (pooled connections, process-wide)
+        client = get_openai_client()
         
         # Generate title using gpt-5
         response = client.chat.completions.create(
@@ -139,8 +139,8 @@ def summarize_text(resource: LearningResource, db: Session = None):
         
         logger.info(f"Generating summary for resource {resource.id}")
         
-        # Initialize OpenAI client
-        client = OpenAI()
+        # Shared OpenAI client (pooled connections, process-wide)
+        client = get_openai_client()
         
         response_schema = {
             "name": "summary_with_emoji",
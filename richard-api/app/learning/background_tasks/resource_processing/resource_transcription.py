@@ -178,7 +178,7 @@ def transcribe_audio(resource: LearningResource, db: Session = None):
     import boto3
     import tempfile
     import os
-    from openai import OpenAI
+    from app.openai_client import get_openai_client
     from app.settings import settings
 
     try:
@@ -222,8 +222,8 @@ def transcribe_audio(resource: LearningResource, db: Session = None):
             s3_client.download_file(bucket_name, s3_key, temp_file_path)
             logger.info(f"Successfully downloaded audio file to: {temp_file_path}")
 
-            # Initialize OpenAI client
-            client = OpenAI()
+            # Shared OpenAI client (pooled connections, process-wide)
+            client = get_openai_client()
 
             # Transcribe audio using GPT-4o-transcribe
             logger.info("Starting transcription with GPT-4o-transcribe...")
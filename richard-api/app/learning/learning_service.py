@@ -1,86 +1,418 @@
 from app.learning.models import LearningResource, LearningResourceFileType, ResourceFolder, FlashCard, MultipleChoiceQuestion, LearningResourceImage
 from app.users.models import User
+from sqlalchemy import select, insert, func, text
 from sqlalchemy.orm import Session, undefer
 from fastapi import Depends, HTTPException
 from app.database import get_db
 from app.settings import settings
 from fastapi import UploadFile
 import zipfile
-import tempfile
 import os
+import re
 import boto3
+from boto3.s3.transfer import TransferConfig
 import uuid
-from typing import List, Optional, Literal, Dict, Any
-from openai import OpenAI
+from typing import AsyncIterator, List, Optional, Literal, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+import zlib
+from app.openai_client import get_async_openai_client
+import tiktoken
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Matches https://bucket-name.s3.region.amazonaws.com/key/path URLs;
+# compiled once at import instead of per delete_s3_file call
+_S3_HTTPS_URL_PATTERN = re.compile(
+    r'https://([^.]+)\.s3\.[^/]+\.amazonaws\.com/(.+)'
+)
+
+# Bound on concurrent S3 DELETE requests when cleaning up many files
+_S3_DELETE_MAX_WORKERS = 8
+
+# Process-wide S3 client. boto3 client construction resolves credentials
+# and loads the service model on every call, which is far too expensive
+# to repeat per request; the client itself is thread-safe, so one shared
+# instance serves every upload/delete (including the thread-pool fan-outs).
+# Built lazily so importing this module never touches AWS config.
+_s3_client = None
+
+
+def _get_s3_client():
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client('s3')
+    return _s3_client
+
+# Transfer tuning shared by every upload_fileobj call: 8 MB parts with a
+# few part-upload threads per file keeps throughput high on large audio/
+# PDF uploads while bounding how much of a file is ever resident at once
+# (at most chunksize x max_concurrency per in-flight upload)
+_S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+
+# Cap on concurrent S3 uploads across the process so a burst of multi-file
+# uploads can't exhaust memory or file descriptors
+_S3_UPLOAD_MAX_CONCURRENCY = 8
+_s3_upload_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_s3_upload_semaphore() -> asyncio.Semaphore:
+    global _s3_upload_semaphore
+    if _s3_upload_semaphore is None:
+        _s3_upload_semaphore = asyncio.Semaphore(_S3_UPLOAD_MAX_CONCURRENCY)
+    return _s3_upload_semaphore
+
+# Only the most recent conversation turns are sent to OpenAI; older turns
+# add tokens (cost and latency) without improving answers to the current
+# question
+_CHAT_HISTORY_WINDOW = 20
+
+# Static template for the chat system prompt. The instructions form a
+# stable prefix; only {resource_context} varies per resource.
+CHAT_SYSTEM_PROMPT_TEMPLATE = """You are a helpful tutor assistant helping a student learn from their study materials.
+
+Your role is to:
+- Answer questions about the content clearly and accurately
+- Help the student understand difficult concepts
+- Provide examples and clarifications when needed
+- Encourage learning and critical thinking
+- Base your answers on the provided content, but you can also add relevant supplementary information
+
+Always be supportive, patient, educational, but brief and succinct in your responses.
+
+The student has provided you with the following learning resource context from their notes:
+
+{resource_context}
+"""
+
+# Summaries at or under this size go into the prompt verbatim. Longer ones
+# are filtered down to the chunks most relevant to the user's question so a
+# sprawling summary doesn't tax every single chat turn with its full length.
+_SUMMARY_CONTEXT_MAX_CHARS = 6000
+
+# Cache of built chat system prompts keyed by resource id and versioned by
+# the row's updated_at, so regenerated notes invalidate the entry on their
+# own. Kept in-process rather than in Redis because the stack has no Redis
+# tier and the prompt is derived purely from two columns this process just
+# read, so per-process copies stay consistent.
+_PROMPT_CACHE_MAX_ENTRIES = 256
+_prompt_cache: OrderedDict = OrderedDict()
+
+
+# In-process cache of chat responses for opening questions (no conversation
+# history). Keyed on (resource_id, whitespace/case-normalized message) so
+# repeat questions like "summarize this" skip the OpenAI round-trip. Entries
+# expire so regenerated summary notes propagate quickly.
+_CHAT_CACHE_TTL_SECONDS = 300
+_CHAT_CACHE_MAX_ENTRIES = 256
+_chat_response_cache: OrderedDict = OrderedDict()
+
+# Responses above this size are stored zlib-compressed. LLM answers are
+# markdown prose that compresses roughly 3x, so a full cache of long
+# answers stays at hundreds of KB instead of MBs of resident memory.
+# Tiny entries skip compression - the header overhead isn't worth it.
+_CHAT_CACHE_COMPRESS_MIN_BYTES = 2048
+_CHAT_CACHE_COMPRESS_LEVEL = 3
+
+# Identical opening questions that arrive while one is already in flight
+# piggyback on its future instead of issuing duplicate OpenAI calls
+_chat_inflight: Dict[tuple, asyncio.Future] = {}
+
+# Model routing for chat: short questions over small contexts don't need
+# the flagship model's latency and cost, so they go to a cheaper/faster
+# model with a capped completion length. Anything long or history-heavy
+# stays on the default model.
+_CHAT_DEFAULT_MODEL = "gpt-5"
+_CHAT_FAST_MODEL = "gpt-4o-mini"
+_CHAT_FAST_MAX_TOKENS = 512
+# Rough chars-per-token for English prose; fallback when the tokenizer
+# can't be loaded
+_CHARS_PER_TOKEN = 4
+_CHAT_FAST_MAX_PROMPT_TOKENS = 2000
+_CHAT_FAST_MAX_HISTORY_TURNS = 4
+
+# Per-message framing overhead in the chat format (role markers etc.)
+_TOKENS_PER_MESSAGE_OVERHEAD = 4
+
+# BPE encoder shared process-wide: building one loads the merge table and
+# compiles its regex, far too expensive to repeat per request. Lazy rather
+# than import-time because the first get_encoding() may fetch the BPE file
+# over the network.
+_token_encoder: Optional["tiktoken.Encoding"] = None
+_token_encoder_failed = False
+
+
+def _count_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Count prompt tokens across a messages list with the shared encoder.
+
+    Falls back to a chars/4 estimate if the encoder can't be loaded, so
+    routing decisions degrade gracefully instead of failing the request.
+    """
+    global _token_encoder, _token_encoder_failed
+
+    if _token_encoder is None and not _token_encoder_failed:
+        try:
+            _token_encoder = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            logger.warning(f"Failed to load tiktoken encoder, falling back to estimate: {e}")
+            _token_encoder_failed = True
+
+    if _token_encoder is None:
+        return sum(len(m["content"]) for m in messages) // _CHARS_PER_TOKEN
+
+    return sum(
+        len(_token_encoder.encode_ordinary(m["content"]))
+        + _TOKENS_PER_MESSAGE_OVERHEAD
+        for m in messages
+    )
+
+
+def _select_chat_model(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Pick model kwargs for a chat completion based on prompt size.
+
+    Returns a dict of keyword arguments (model, and max_completion_tokens
+    for the fast tier) to splat into the completions call.
+    """
+    # messages = [system, *history, user]; anything beyond two entries is
+    # carried history
+    history_turns = len(messages) - 2
+    estimated_tokens = _count_tokens(messages)
+
+    if (
+        history_turns <= _CHAT_FAST_MAX_HISTORY_TURNS
+        and estimated_tokens < _CHAT_FAST_MAX_PROMPT_TOKENS
+    ):
+        return {
+            "model": _CHAT_FAST_MODEL,
+            "max_completion_tokens": _CHAT_FAST_MAX_TOKENS,
+        }
+
+    return {"model": _CHAT_DEFAULT_MODEL}
+
+
+# Bound on concurrent OpenAI completions. Requests beyond the bound wait
+# briefly for a slot and are then shed with a 503 so a slow upstream can't
+# pile up unbounded work on the event loop.
+_OPENAI_MAX_CONCURRENCY = 16
+_OPENAI_ACQUIRE_TIMEOUT_SECONDS = 10.0
+_openai_semaphore: Optional[asyncio.Semaphore] = None
+
+
+async def _acquire_openai_slot() -> asyncio.Semaphore:
+    global _openai_semaphore
+    if _openai_semaphore is None:
+        _openai_semaphore = asyncio.Semaphore(_OPENAI_MAX_CONCURRENCY)
+
+    try:
+        await asyncio.wait_for(
+            _openai_semaphore.acquire(), _OPENAI_ACQUIRE_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Chat is busy right now. Please try again shortly."
+        )
+
+    return _openai_semaphore
+
+
+def _select_relevant_summary_chunks(summary_notes: str, message: str) -> str:
+    """
+    Trim an oversized summary down to the paragraphs most relevant to the
+    user's question.
+
+    The stack has no embedding store, so relevance is scored by lexical
+    overlap between each paragraph and the message - crude next to a real
+    vector search, but it keeps prompt size bounded for any summary length
+    without an extra network hop per turn.
+    """
+    chunks = [c.strip() for c in summary_notes.split("\n\n") if c.strip()]
+    if len(chunks) <= 1:
+        return summary_notes[:_SUMMARY_CONTEXT_MAX_CHARS]
+
+    message_words = {w for w in message.lower().split() if len(w) > 3}
+
+    scored = []
+    for index, chunk in enumerate(chunks):
+        chunk_words = set(chunk.lower().split())
+        score = len(message_words & chunk_words)
+        scored.append((score, index, chunk))
+
+    # Highest-overlap chunks first; ties fall back to document order so a
+    # vague question still gets the leading paragraphs
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    selected = []
+    budget = _SUMMARY_CONTEXT_MAX_CHARS
+    for _, index, chunk in scored:
+        if len(chunk) > budget:
+            continue
+        selected.append((index, chunk))
+        budget -= len(chunk)
+
+    if not selected:
+        return chunks[0][:_SUMMARY_CONTEXT_MAX_CHARS]
+
+    # Reassemble in original document order so the excerpt still reads
+    # coherently
+    selected.sort()
+    return "\n\n".join(chunk for _, chunk in selected)
+
+
+def _chat_cache_key(resource_id: int, message: str) -> tuple:
+    return (resource_id, " ".join(message.lower().split()))
+
+
+def _chat_cache_get(key: tuple) -> Optional[str]:
+    entry = _chat_response_cache.get(key)
+    if entry is None:
+        return None
+    cached_at, payload = entry
+    if time.monotonic() - cached_at > _CHAT_CACHE_TTL_SECONDS:
+        _chat_response_cache.pop(key, None)
+        return None
+    _chat_response_cache.move_to_end(key)
+    # Large payloads are stored as compressed bytes, small ones as str
+    if isinstance(payload, bytes):
+        return zlib.decompress(payload).decode("utf-8")
+    return payload
+
+
+def _chat_cache_put(key: tuple, response: str) -> None:
+    payload: Any = response
+    encoded = response.encode("utf-8")
+    if len(encoded) >= _CHAT_CACHE_COMPRESS_MIN_BYTES:
+        payload = zlib.compress(encoded, _CHAT_CACHE_COMPRESS_LEVEL)
+    _chat_response_cache[key] = (time.monotonic(), payload)
+    _chat_response_cache.move_to_end(key)
+    while len(_chat_response_cache) > _CHAT_CACHE_MAX_ENTRIES:
+        _chat_response_cache.popitem(last=False)
+
+
+# Fallback file extensions for image uploads whose filename has none
+_CONTENT_TYPE_TO_EXTENSION = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+# Region resolved once per process; the bucket lives in a single region so
+# there is no need to consult client metadata for every URL we build
+_s3_region: Optional[str] = None
+
+
+def _s3_object_url(s3_client, bucket_name: str, s3_key: str) -> str:
+    """Build the public HTTPS URL for an uploaded S3 object."""
+    global _s3_region
+    if _s3_region is None:
+        _s3_region = s3_client.meta.region_name or 'us-east-2'
+    return f"https://{bucket_name}.s3.{_s3_region}.amazonaws.com/{s3_key}"
+
 
 class LearningService:
     def __init__(self, db: Session = Depends(get_db)):
         self.db = db
 
+    def _owned_resource_subq(self, resource_id: int, user_id: int):
+        """
+        Build a scalar subquery matching a resource owned by the given user.
+
+        Folding the ownership check into the child-table query lets the hot
+        GET paths cost a single database round-trip instead of two.
+        """
+        return (
+            select(LearningResource.id)
+            .where(
+                LearningResource.id == resource_id,
+                LearningResource.user_id == user_id,
+            )
+            .scalar_subquery()
+        )
+
+    def _raise_if_resource_missing(self, resource_id: int, user_id: int) -> None:
+        """
+        Disambiguate "resource not found" from "resource has no children".
+
+        Only called on the empty-result path, so the extra round-trip is
+        never paid when the child query returns rows.
+        """
+        resource_exists = self.db.query(
+            self.db.query(LearningResource)
+            .filter(
+                LearningResource.id == resource_id,
+                LearningResource.user_id == user_id,
+            )
+            .exists()
+        ).scalar()
+
+        if not resource_exists:
+            raise HTTPException(status_code=404, detail="Resource not found")
+
     async def decompress_and_upload_file(self, file: UploadFile) -> str:
         """
-        Decompress a zip file, extract the single file, and upload to S3
+        Decompress a zip file, extract the single file, and stream it to S3
         Returns the S3 URL of the uploaded file
+
+        The zip member never touches local disk: zipfile reads directly from
+        the upload's spooled file object and the member stream is fed to a
+        multipart S3 upload.
         """
         try:
-            # Initialize S3 client
-            s3_client = boto3.client('s3')
+            s3_client = _get_s3_client()
             bucket_name = settings.files_s3_bucket_name
-            
+
             # Generate unique file name
             file_id = str(uuid.uuid4())
-            
-            # Create temporary directory for extraction
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Save uploaded file temporarily
-                temp_zip_path = os.path.join(temp_dir, file.filename)
-                with open(temp_zip_path, 'wb') as temp_file:
-                    content = await file.read()
-                    temp_file.write(content)
-                
-                # Extract zip file
-                with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                
-                # Find the first (and only) extracted file
-                extracted_file = None
-                for root, dirs, files in os.walk(temp_dir):
-                    for filename in files:
-                        # Skip the original zip file
-                        if filename == file.filename:
-                            continue
-                        extracted_file = os.path.join(root, filename)
-                        break
-                    if extracted_file:
-                        break
-                
-                if not extracted_file:
+
+            # Read the zip directly from the uploaded file object
+            with zipfile.ZipFile(file.file) as zip_ref:
+                # Find the first (and only) real member lazily, skipping
+                # directories and archiver metadata (e.g. macOS __MACOSX/
+                # entries and hidden dotfiles)
+                member = None
+                for info in zip_ref.infolist():
+                    if info.is_dir() or info.filename == file.filename:
+                        continue
+                    member_name = os.path.basename(info.filename)
+                    if info.filename.startswith('__MACOSX/') or member_name.startswith('.'):
+                        continue
+                    member = info
+                    break
+
+                if member is None:
                     raise HTTPException(status_code=400, detail="No files found in zip archive")
-                
-                # Get original filename from extracted file
-                original_filename = os.path.basename(extracted_file)
+
+                # Get original filename from the zip member
+                original_filename = os.path.basename(member.filename)
                 file_extension = os.path.splitext(original_filename)[1]
-                
+
                 # Create S3 key with unique ID
                 s3_key = f"learning-resources/{file_id}{file_extension}"
-                
-                # Upload to S3
-                s3_client.upload_file(
-                    extracted_file,
-                    bucket_name,
-                    s3_key
-                )
 
-                # Get the region from the S3 client
-                region = s3_client.meta.region_name or 'us-east-2'
+                # Stream the member straight into S3 (multipart under the
+                # hood); the blocking upload runs on a worker thread so it
+                # doesn't stall the event loop
+                async with _get_s3_upload_semaphore():
+                    with zip_ref.open(member) as member_stream:
+                        await asyncio.to_thread(
+                            s3_client.upload_fileobj,
+                            member_stream, bucket_name, s3_key,
+                            Config=_S3_TRANSFER_CONFIG,
+                        )
+
+            # Return the HTTPS URL instead of S3 URI
+            return _s3_object_url(s3_client, bucket_name, s3_key)
 
-                # Return the HTTPS URL instead of S3 URI
-                return f"https://{bucket_name}.s3.{region}.amazonaws.com/{s3_key}"
-                
         except zipfile.BadZipFile:
             raise HTTPException(status_code=400, detail="Invalid zip file format")
         except Exception as e:
@@ -88,84 +420,100 @@ class LearningService:
 
     async def upload_images_to_s3(self, files: List[UploadFile]) -> List[str]:
         """
-        Upload multiple image files to S3.
-        Returns a list of S3 URLs for the uploaded images.
+        Upload multiple image files to S3 concurrently.
+
+        Each upload streams the spooled upload file straight into a
+        multipart S3 upload on a worker thread - nothing is buffered whole
+        in memory and the event loop stays free. Concurrency is bounded by
+        the module-level upload semaphore.
+
+        Returns a list of S3 URLs in the order the files were given.
         """
         try:
-            # Initialize S3 client
-            s3_client = boto3.client('s3')
+            s3_client = _get_s3_client()
             bucket_name = settings.files_s3_bucket_name
 
-            uploaded_urls = []
-
+            # Validate all file types up front so nothing is uploaded if
+            # any file in the batch is rejected
             for file in files:
-                # Validate file type
                 if not file.content_type or not file.content_type.startswith('image/'):
                     raise HTTPException(
                         status_code=400,
                         detail=f"Invalid file type for {file.filename}. Only image files are allowed."
                     )
 
+            async def upload_one(file: UploadFile) -> str:
                 # Generate unique file name
                 file_id = str(uuid.uuid4())
                 file_extension = os.path.splitext(file.filename)[1]
 
                 if not file_extension:
                     # Try to get extension from content type
-                    content_type_map = {
-                        'image/jpeg': '.jpg',
-                        'image/png': '.png',
-                        'image/gif': '.gif',
-                        'image/webp': '.webp'
-                    }
-                    file_extension = content_type_map.get(file.content_type, '.jpg')
+                    file_extension = _CONTENT_TYPE_TO_EXTENSION.get(
+                        file.content_type, '.jpg'
+                    )
 
                 # Create S3 key with unique ID
                 s3_key = f"images/{file_id}{file_extension}"
 
-                # Read file content
-                file_content = await file.read()
-
-                # Upload to S3
-                s3_client.put_object(
-                    Bucket=bucket_name,
-                    Key=s3_key,
-                    Body=file_content,
-                    ContentType=file.content_type
-                )
-
-                # Get the region from the S3 client
-                region = s3_client.meta.region_name or 'us-east-2'
-
-                # Create the HTTPS URL
-                image_url = f"https://{bucket_name}.s3.{region}.amazonaws.com/{s3_key}"
-                uploaded_urls.append(image_url)
+                async with _get_s3_upload_semaphore():
+                    await asyncio.to_thread(
+                        s3_client.upload_fileobj,
+                        file.file, bucket_name, s3_key,
+                        {'ContentType': file.content_type},
+                        Config=_S3_TRANSFER_CONFIG,
+                    )
 
-                # Reset file pointer for potential re-use
-                await file.seek(0)
+                return _s3_object_url(s3_client, bucket_name, s3_key)
 
-            return uploaded_urls
+            # gather preserves input order in its results
+            return list(await asyncio.gather(*(upload_one(f) for f in files)))
 
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Image upload error: {str(e)}")
 
-    def list_user_folders(self, user_id: int) -> List[ResourceFolder]:
+    def list_user_folders(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
-        List all folders that belong to a specific user.
+        List folders that belong to a specific user, newest first.
+
+        Keyset-paginated on id (ids are assigned in creation order, so id
+        order matches created_at order): the cursor filter is an indexed
+        range condition, unlike OFFSET which scans and discards rows.
 
         Args:
             user_id: ID of the user
+            limit: Maximum number of folders to return
+            cursor: id from a previous page's next_cursor, or None
 
         Returns:
-            List of ResourceFolder objects ordered by created_at desc (most recent first)
+            Dict with "items" (folder dicts) and "next_cursor" (None on
+            the last page)
         """
-        folders = self.db.query(ResourceFolder).filter(
-            ResourceFolder.user_id == user_id
-        ).order_by(ResourceFolder.created_at.desc()).all()
+        query = self.db.query(
+            ResourceFolder.id,
+            ResourceFolder.name,
+            ResourceFolder.parent_folder_id,
+            ResourceFolder.created_at,
+            ResourceFolder.updated_at,
+        ).filter(ResourceFolder.user_id == user_id)
 
-        return folders
+        if cursor is not None:
+            query = query.filter(ResourceFolder.id < cursor)
+
+        rows = query.order_by(ResourceFolder.id.desc()).limit(limit).all()
+
+        items = [dict(row._mapping) for row in rows]
+        return {
+            "items": items,
+            "next_cursor": items[-1]["id"] if len(items) == limit else None,
+        }
 
     def get_folder_contents(
         self,
@@ -176,6 +524,11 @@ class LearningService:
         """
         Get contents of a specific folder with optional filtering by item type.
 
+        One UNION ALL statement fetches the folder row (which doubles as
+        the ownership check), its subfolders and its resources together,
+        so the endpoint costs a single database round-trip instead of
+        three. Immediate children only - no tree walk is involved.
+
         Args:
             folder_id: ID of the folder to get contents from
             user_id: ID of the current user (for security)
@@ -187,64 +540,85 @@ class LearningService:
         Raises:
             HTTPException: If folder not found or doesn't belong to user
         """
-        folder = self.db.query(ResourceFolder).filter(
-            ResourceFolder.id == folder_id,
-            ResourceFolder.user_id == user_id
-        ).first()
-        
-        if not folder:
+        # Branch columns are aligned positionally; the kind tag tells the
+        # rows apart. ORDER BY kind sorts folders before resources (with
+        # the self row last, which is filtered out), newest first within
+        # each section.
+        parts = [
+            """
+            SELECT 'self' AS kind, id, name, NULL AS title, NULL AS emoji,
+                   parent_folder_id, NULL AS resource_type,
+                   NULL AS folder_id, NULL AS file_url,
+                   NULL AS image_urls, NULL AS status,
+                   created_at, updated_at
+            FROM resource_folders
+            WHERE id = :fid AND user_id = :uid
+            """
+        ]
+        if item_type is None or item_type == "folder":
+            parts.append(
+                """
+                SELECT 'folder', id, name, NULL, NULL,
+                       parent_folder_id, NULL, NULL, NULL, NULL, NULL,
+                       created_at, updated_at
+                FROM resource_folders
+                WHERE parent_folder_id = :fid AND user_id = :uid
+                """
+            )
+        if item_type is None or item_type == "resource":
+            parts.append(
+                """
+                SELECT 'resource', id, NULL, title, emoji,
+                       NULL, resource_type, folder_id, file_url,
+                       image_urls, status,
+                       created_at, updated_at
+                FROM learning_resources
+                WHERE folder_id = :fid AND user_id = :uid
+                """
+            )
+
+        rows = self.db.execute(
+            text(
+                " UNION ALL ".join(parts)
+                + " ORDER BY kind, created_at DESC"
+            ),
+            {"fid": folder_id, "uid": user_id},
+        ).mappings().all()
+
+        folder_row = next((row for row in rows if row["kind"] == "self"), None)
+        if folder_row is None:
             raise HTTPException(status_code=404, detail="Folder not found")
-            
-        folder_name = folder.name
-        folder_created_at = folder.created_at
-        
+
         items = []
-        
-        # Get subfolders if requested (sorted by created_at desc)
-        if item_type is None or item_type == "folder":
-            subfolders = self.db.query(ResourceFolder).filter(
-                ResourceFolder.parent_folder_id == folder_id,
-                ResourceFolder.user_id == user_id
-            ).order_by(ResourceFolder.created_at.desc()).all()
-            
-            for subfolder in subfolders:
+        for row in rows:
+            if row["kind"] == "folder":
                 items.append({
-                    "id": subfolder.id,
-                    "name": subfolder.name,
-                    "parent_folder_id": subfolder.parent_folder_id,
-                    "created_at": subfolder.created_at,
-                    "updated_at": subfolder.updated_at,
+                    "id": row["id"],
+                    "name": row["name"],
+                    "parent_folder_id": row["parent_folder_id"],
+                    "created_at": row["created_at"],
+                    "updated_at": row["updated_at"],
                     "type": "folder"
                 })
-        
-        # Get resources if requested (sorted by created_at desc)
-        if item_type is None or item_type == "resource":
-            resources = self.db.query(LearningResource).filter(
-                LearningResource.folder_id == folder_id,
-                LearningResource.user_id == user_id
-            ).order_by(LearningResource.created_at.desc()).all()
-            
-            for resource in resources:
+            elif row["kind"] == "resource":
                 items.append({
-                    "id": resource.id,
-                    "title": resource.title,
-                    "emoji": resource.emoji,
-                    "resource_type": resource.resource_type,
-                    "folder_id": resource.folder_id,
-                    "file_url": resource.file_url,
-                    "status": resource.status,
-                    "created_at": resource.created_at,
-                    "updated_at": resource.updated_at,
+                    "id": row["id"],
+                    "title": row["title"],
+                    "emoji": row["emoji"],
+                    "resource_type": row["resource_type"],
+                    "folder_id": row["folder_id"],
+                    "file_url": row["file_url"],
+                    "image_urls": row["image_urls"],
+                    "status": row["status"],
+                    "created_at": row["created_at"],
+                    "updated_at": row["updated_at"],
                     "type": "resource"
                 })
-        
-        # Sort items: folders first, then resources (both already sorted reverse chronologically)
-        # items.sort(key=lambda x: (x["type"] != "folder", x["created_at"]), reverse=False)
-        
+
         return {
             "folder_id": folder_id,
-            "folder_name": folder_name,
-            "created_at": folder_created_at,
+            "folder_name": folder_row["name"],
+            "created_at": folder_row["created_at"],
             "items": items
         }
 
@@ -273,27 +647,39 @@ class LearningService:
 
         self.db.add(resource)
 
-        # Increment user's resource count
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if user:
-            user.resource_count = (user.resource_count or 0) + 1
+        # Atomic increment of the user's resource count - no read-modify-write,
+        # so concurrent creates can't lose updates
+        self.db.query(User).filter(User.id == user_id).update(
+            {User.resource_count: func.coalesce(User.resource_count, 0) + 1},
+            synchronize_session=False,
+        )
 
+        # The INSERT ... RETURNING emitted at flush time already populates the
+        # PK and server defaults (eager_defaults on the model), so no
+        # post-commit refresh SELECT is needed
+        self.db.flush()
         self.db.commit()
-        self.db.refresh(resource)
 
         # Handle multiple image uploads for IMAGE resource type
         if resource_type == LearningResourceFileType.IMAGE and files:
             image_urls = await self.upload_images_to_s3(files)
 
-            # Create LearningResourceImage records for each uploaded image
-            for image_url in image_urls:
-                resource_image = LearningResourceImage(
-                    user_id=user_id,
-                    resource_id=resource.id,
-                    image_url=image_url
-                )
-                self.db.add(resource_image)
-
+            # Denormalized onto the resource row so detail reads skip the
+            # image-table query
+            resource.image_urls = image_urls
+
+            # Bulk-insert all image records in a single INSERT statement
+            self.db.execute(
+                insert(LearningResourceImage),
+                [
+                    {
+                        "user_id": user_id,
+                        "resource_id": resource.id,
+                        "image_url": image_url,
+                    }
+                    for image_url in image_urls
+                ],
+            )
             self.db.commit()
 
         return resource
@@ -334,10 +720,16 @@ class LearningService:
             user_id=user_id,
             parent_folder_id=parent_folder_id
         )
-        
+
         self.db.add(folder)
+        self.db.flush()
+        # Extend the parent's path with our freshly assigned id; root-level
+        # folders start their own chain
+        if parent_folder_id is not None:
+            folder.materialized_path = f"{parent_folder.materialized_path}{folder.id}/"
+        else:
+            folder.materialized_path = f"/{folder.id}/"
         self.db.commit()
-        self.db.refresh(folder)
         return folder
 
     def get_resource(
@@ -390,40 +782,92 @@ class LearningService:
 
         return [image.image_url for image in images]
 
-    def get_flash_cards(
+    def get_resource_with_images(
         self,
         resource_id: int,
         user_id: int
     ):
         """
-        Get all flash cards for a specific learning resource.
-        
+        Get a resource and its image URLs in one call.
+
+        The URL list is denormalized onto the resource row at ingest, so
+        this is a single row read - no second query against the image
+        table even for image resources.
+
+        Returns:
+            Tuple of (LearningResource, list of image URLs)
+
+        Raises:
+            HTTPException: If resource not found or doesn't belong to user
+        """
+        resource = self.get_resource(resource_id=resource_id, user_id=user_id)
+
+        return resource, list(resource.image_urls or [])
+
+    def verify_resource_ownership(self, resource_id: int, user_id: int) -> None:
+        """
+        Raise 404 unless the resource exists and belongs to the user.
+
+        An EXISTS probe instead of loading the whole row - the endpoints
+        that kick off background generation only need the check, not the
+        resource data.
+        """
+        self._raise_if_resource_missing(resource_id, user_id)
+
+    def get_flash_cards(
+        self,
+        resource_id: int,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ):
+        """
+        Get flash cards for a specific learning resource, newest first.
+
+        Keyset-paginated on id so a resource with thousands of cards
+        costs a bounded query and a bounded response.
+
         Args:
             resource_id: ID of the resource to get flash cards for
             user_id: ID of the current user (for security)
-            
+            limit: Maximum number of cards to return
+            cursor: id from a previous page's next_cursor, or None
+
         Returns:
-            List of FlashCard objects for the resource
-            
+            Dict with "items" (flash card dicts) and "next_cursor"
+
         Raises:
             HTTPException: If resource not found or doesn't belong to user
         """
-        # First verify the resource exists and belongs to the user
-        resource = self.db.query(LearningResource).filter(
-            LearningResource.id == resource_id,
-            LearningResource.user_id == user_id
-        ).first()
-        
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
-        
-        # Get all flash cards for this resource
-        flash_cards = self.db.query(FlashCard).filter(
-            FlashCard.resource_id == resource_id,
-            FlashCard.user_id == user_id
-        ).order_by(FlashCard.created_at.desc()).all()
-        
-        return flash_cards
+        # Single query: ownership check folded into the flash card lookup.
+        # Column-only select so hundreds of cards don't each pay for full
+        # ORM entity construction on the way to JSON.
+        query = self.db.query(
+            FlashCard.id,
+            FlashCard.resource_id,
+            FlashCard.front,
+            FlashCard.back,
+            FlashCard.created_at,
+            FlashCard.updated_at,
+        ).filter(
+            FlashCard.resource_id == self._owned_resource_subq(resource_id, user_id)
+        )
+
+        if cursor is not None:
+            query = query.filter(FlashCard.id < cursor)
+
+        rows = query.order_by(FlashCard.id.desc()).limit(limit).all()
+
+        # An empty first page may mean the resource doesn't exist; an
+        # empty later page just means the cursor ran past the end
+        if not rows and cursor is None:
+            self._raise_if_resource_missing(resource_id, user_id)
+
+        items = [dict(row._mapping) for row in rows]
+        return {
+            "items": items,
+            "next_cursor": items[-1]["id"] if len(items) == limit else None,
+        }
 
     def get_resource_transcript(
         self,
@@ -456,170 +900,152 @@ class LearningService:
         
         return resource.transcript
 
-    def check_flash_cards_exist(
-        self,
-        resource_id: int,
-        user_id: int
-    ) -> bool:
+    def get_resource_version(self, resource_id: int, user_id: int) -> float:
         """
-        Check if any flash cards exist for a specific learning resource.
-        
-        Args:
-            resource_id: ID of the resource to check for flash cards
-            user_id: ID of the current user (for security)
-            
-        Returns:
-            True if flash cards exist for the resource, False otherwise
-            
-        Raises:
-            HTTPException: If resource not found or doesn't belong to user
-        """
-        # First verify the resource exists and belongs to the user
-        resource = self.db.query(LearningResource).filter(
-            LearningResource.id == resource_id,
-            LearningResource.user_id == user_id
-        ).first()
-        
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
-        
-        # Check if any flash cards exist for this resource
-        flash_card_count = self.db.query(FlashCard).filter(
-            FlashCard.resource_id == resource_id,
-            FlashCard.user_id == user_id
-        ).count()
-        
-        return flash_card_count > 0
+        Cheap change marker for ETag revalidation: the row's updated_at.
 
-    def check_quiz_questions_exist(
-        self,
-        resource_id: int,
-        user_id: int
-    ) -> bool:
-        """
-        Check if any quiz questions exist for a specific learning resource.
-        
         Args:
-            resource_id: ID of the resource to check for quiz questions
+            resource_id: ID of the resource
             user_id: ID of the current user (for security)
-            
-        Returns:
-            True if quiz questions exist for the resource, False otherwise
-            
+
         Raises:
             HTTPException: If resource not found or doesn't belong to user
         """
-        # First verify the resource exists and belongs to the user
-        resource = self.db.query(LearningResource).filter(
+        updated_at = self.db.query(LearningResource.updated_at).filter(
             LearningResource.id == resource_id,
             LearningResource.user_id == user_id
-        ).first()
-        
-        if not resource:
+        ).scalar()
+
+        if updated_at is None:
             raise HTTPException(status_code=404, detail="Resource not found")
-        
-        # Check if any quiz questions exist for this resource
-        quiz_question_count = self.db.query(MultipleChoiceQuestion).filter(
-            MultipleChoiceQuestion.resource_id == resource_id,
-            MultipleChoiceQuestion.user_id == user_id
-        ).count()
-        
-        return quiz_question_count > 0
 
-    def get_quiz_questions(
-        self,
-        resource_id: int,
-        user_id: int
-    ):
+        return updated_at.timestamp()
+
+    def _collection_version(self, model, resource_id: int, user_id: int) -> str:
         """
-        Get all quiz questions for a specific learning resource.
-        
-        Args:
-            resource_id: ID of the resource to get quiz questions for
-            user_id: ID of the current user (for security)
-            
-        Returns:
-            List of MultipleChoiceQuestion objects for the resource
-            
-        Raises:
-            HTTPException: If resource not found or doesn't belong to user
+        Change marker for a resource's child collection (flash cards or
+        quiz questions): row count plus latest updated_at, so both
+        additions and deletions invalidate the tag.
         """
-        # First verify the resource exists and belongs to the user
-        resource = self.db.query(LearningResource).filter(
-            LearningResource.id == resource_id,
-            LearningResource.user_id == user_id
+        count, max_updated = self.db.query(
+            func.count(model.id), func.max(model.updated_at)
+        ).filter(
+            model.resource_id == self._owned_resource_subq(resource_id, user_id)
         ).first()
-        
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
-        
-        # Get all quiz questions for this resource
-        quiz_questions = self.db.query(MultipleChoiceQuestion).filter(
-            MultipleChoiceQuestion.resource_id == resource_id,
-            MultipleChoiceQuestion.user_id == user_id
-        ).order_by(MultipleChoiceQuestion.created_at.desc()).all()
-        
-        return quiz_questions
 
-    def check_transcript_exists(
+        if count == 0:
+            self._raise_if_resource_missing(resource_id, user_id)
+            return "0"
+
+        return f"{count}-{max_updated.timestamp()}"
+
+    def get_flash_cards_version(self, resource_id: int, user_id: int) -> str:
+        """Change marker for a resource's flash cards (see _collection_version)."""
+        return self._collection_version(FlashCard, resource_id, user_id)
+
+    def get_quiz_questions_version(self, resource_id: int, user_id: int) -> str:
+        """Change marker for a resource's quiz questions (see _collection_version)."""
+        return self._collection_version(MultipleChoiceQuestion, resource_id, user_id)
+
+    def check_artifacts_exist(
         self,
         resource_id: int,
         user_id: int
-    ) -> bool:
+    ) -> Dict[str, bool]:
         """
-        Check if a transcript exists for a specific learning resource.
+        Check which generated artifacts exist for a resource in one query.
+
+        Selecting the EXISTS probes and content-column checks off the
+        ownership-filtered resource row answers all four questions in a
+        single round-trip; a missing row doubles as the 404 check.
 
         Args:
-            resource_id: ID of the resource to check for transcript
-            user_id: ID of the user who owns the resource
+            resource_id: ID of the resource to check
+            user_id: ID of the current user (for security)
 
         Returns:
-            True if transcript exists for the resource, False otherwise
+            Dict with has_flash_cards, has_quiz_questions, has_transcript
+            and has_summary_notes booleans
 
         Raises:
             HTTPException: If resource not found or doesn't belong to user
         """
-        # First verify the resource exists and belongs to the user
-        resource = self.db.query(LearningResource).filter(
+        row = self.db.query(
+            self.db.query(FlashCard)
+            .filter(FlashCard.resource_id == resource_id)
+            .exists(),
+            self.db.query(MultipleChoiceQuestion)
+            .filter(MultipleChoiceQuestion.resource_id == resource_id)
+            .exists(),
+            func.coalesce(func.trim(LearningResource.transcript) != '', False),
+            func.coalesce(func.trim(LearningResource.summary_notes) != '', False),
+        ).filter(
             LearningResource.id == resource_id,
             LearningResource.user_id == user_id
         ).first()
 
-        if not resource:
+        if row is None:
             raise HTTPException(status_code=404, detail="Resource not found")
 
-        # Check if transcript exists and is not None/empty
-        return resource.transcript is not None and resource.transcript.strip() != ""
+        return {
+            "has_flash_cards": bool(row[0]),
+            "has_quiz_questions": bool(row[1]),
+            "has_transcript": bool(row[2]),
+            "has_summary_notes": bool(row[3]),
+        }
 
-    def check_summary_notes_exist(
+    def get_quiz_questions(
         self,
         resource_id: int,
-        user_id: int
-    ) -> bool:
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ):
         """
-        Check if summary notes exist for a specific learning resource.
+        Get quiz questions for a specific learning resource, newest first.
+
+        Keyset-paginated on id, same contract as get_flash_cards.
 
         Args:
-            resource_id: ID of the resource to check for summary notes
-            user_id: ID of the user who owns the resource
+            resource_id: ID of the resource to get quiz questions for
+            user_id: ID of the current user (for security)
+            limit: Maximum number of questions to return
+            cursor: id from a previous page's next_cursor, or None
 
         Returns:
-            True if summary notes exist for the resource, False otherwise
+            Dict with "items" (quiz question dicts) and "next_cursor"
 
         Raises:
             HTTPException: If resource not found or doesn't belong to user
         """
-        # First verify the resource exists and belongs to the user
-        resource = self.db.query(LearningResource).filter(
-            LearningResource.id == resource_id,
-            LearningResource.user_id == user_id
-        ).first()
+        # Single query: ownership check folded into the quiz question
+        # lookup. Column-only select, same rationale as get_flash_cards;
+        # options is stored as a JSON list so it serializes as-is.
+        query = self.db.query(
+            MultipleChoiceQuestion.id,
+            MultipleChoiceQuestion.resource_id,
+            MultipleChoiceQuestion.question,
+            MultipleChoiceQuestion.options,
+            MultipleChoiceQuestion.correct_option,
+            MultipleChoiceQuestion.created_at,
+            MultipleChoiceQuestion.updated_at,
+        ).filter(
+            MultipleChoiceQuestion.resource_id == self._owned_resource_subq(resource_id, user_id)
+        )
 
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
+        if cursor is not None:
+            query = query.filter(MultipleChoiceQuestion.id < cursor)
+
+        rows = query.order_by(MultipleChoiceQuestion.id.desc()).limit(limit).all()
 
-        # Check if summary_notes exists and is not None/empty
-        return resource.summary_notes is not None and resource.summary_notes.strip() != ""
+        if not rows and cursor is None:
+            self._raise_if_resource_missing(resource_id, user_id)
+
+        items = [dict(row._mapping) for row in rows]
+        return {
+            "items": items,
+            "next_cursor": items[-1]["id"] if len(items) == limit else None,
+        }
 
     def delete_s3_file(self, file_url: str) -> bool:
         """
@@ -636,8 +1062,7 @@ class LearningService:
             return True  # Nothing to delete
 
         try:
-            # Initialize S3 client
-            s3_client = boto3.client('s3')
+            s3_client = _get_s3_client()
             bucket_name = settings.files_s3_bucket_name
 
             # Extract bucket and key from S3 URL
@@ -649,8 +1074,7 @@ class LearningService:
                 file_bucket, s3_key = url_parts
             elif file_url.startswith('https://') and '.s3.' in file_url:
                 # Format: https://bucket-name.s3.region.amazonaws.com/key/path
-                import re
-                match = re.match(r'https://([^.]+)\.s3\.[^/]+\.amazonaws\.com/(.+)', file_url)
+                match = _S3_HTTPS_URL_PATTERN.match(file_url)
                 if match:
                     file_bucket = match.group(1)
                     s3_key = match.group(2)
@@ -672,6 +1096,30 @@ class LearningService:
             print(f"Warning: Failed to delete S3 file {file_url}: {str(e)}")
             return False
 
+    def delete_s3_files(self, file_urls: List[str]) -> None:
+        """
+        Delete multiple files from S3 in parallel.
+
+        Each delete is a blocking HTTP round-trip, so a bounded thread pool
+        turns a folder full of files from n sequential round-trips into
+        roughly n / pool-size.
+
+        Args:
+            file_urls: S3 URLs to delete (falsy entries are skipped)
+        """
+        file_urls = [file_url for file_url in file_urls if file_url]
+
+        if not file_urls:
+            return
+
+        if len(file_urls) == 1:
+            self.delete_s3_file(file_urls[0])
+            return
+
+        with ThreadPoolExecutor(max_workers=_S3_DELETE_MAX_WORKERS) as executor:
+            # delete_s3_file already swallows per-file errors, so map is safe
+            list(executor.map(self.delete_s3_file, file_urls))
+
     def delete_resource(
         self,
         resource_id: int,
@@ -699,19 +1147,17 @@ class LearningService:
         if not resource:
             raise HTTPException(status_code=404, detail="Resource not found")
 
-        # Delete S3 file if it exists and is from our bucket
-        if resource.file_url:
-            self.delete_s3_file(resource.file_url)
-
-        # Delete associated resource images and their S3 files
+        # Collect the resource file and image files, then delete them from S3
+        # in parallel
         resource_images = self.db.query(LearningResourceImage).filter(
             LearningResourceImage.resource_id == resource_id,
             LearningResourceImage.user_id == user_id
         ).all()
 
-        for resource_image in resource_images:
-            if resource_image.image_url:
-                self.delete_s3_file(resource_image.image_url)
+        self.delete_s3_files(
+            [resource.file_url]
+            + [resource_image.image_url for resource_image in resource_images]
+        )
 
         self.db.query(LearningResourceImage).filter(
             LearningResourceImage.resource_id == resource_id,
@@ -732,6 +1178,17 @@ class LearningService:
 
         # Delete the resource itself
         self.db.delete(resource)
+
+        # Keep the denormalized counter in step with the atomic increment
+        # on create; greatest() guards against drifted data going negative
+        self.db.query(User).filter(User.id == user_id).update(
+            {
+                User.resource_count: func.greatest(
+                    func.coalesce(User.resource_count, 0) - 1, 0
+                )
+            },
+            synchronize_session=False,
+        )
         self.db.commit()
 
         return True
@@ -742,7 +1199,13 @@ class LearningService:
         user_id: int
     ) -> bool:
         """
-        Recursively delete a folder and all its contents.
+        Delete a folder and all its contents (subfolders, resources, and
+        their artifacts).
+
+        The whole subtree is resolved in one indexed LIKE prefix match on
+        materialized_path, so deletion costs a fixed handful of bulk
+        statements regardless of nesting depth - the old implementation
+        recursed in Python and issued several queries per folder per level.
 
         Args:
             folder_id: ID of the folder to delete
@@ -767,81 +1230,180 @@ class LearningService:
         if not folder:
             raise HTTPException(status_code=404, detail="Folder not found")
 
-        # Recursively delete all contents
-        self._recursive_delete_folder_contents(folder_id, user_id)
+        # Every folder in the subtree, the target included, shares this
+        # path prefix (paths are digits and slashes, so no LIKE escaping
+        # is needed)
+        folder_ids = [
+            row[0]
+            for row in self.db.query(ResourceFolder.id).filter(
+                ResourceFolder.user_id == user_id,
+                ResourceFolder.materialized_path.like(
+                    folder.materialized_path + "%"
+                ),
+            ).all()
+        ]
+
+        # Collect the S3 objects to remove before the rows disappear
+        resource_rows = self.db.query(
+            LearningResource.id, LearningResource.file_url
+        ).filter(
+            LearningResource.folder_id.in_(folder_ids),
+            LearningResource.user_id == user_id
+        ).all()
+        resource_ids = [row[0] for row in resource_rows]
+        s3_urls = [row[1] for row in resource_rows]
+
+        if resource_ids:
+            image_rows = self.db.query(
+                LearningResourceImage.image_url
+            ).filter(
+                LearningResourceImage.resource_id.in_(resource_ids)
+            ).all()
+            s3_urls.extend(row[0] for row in image_rows)
 
-        # Delete the folder itself
-        self.db.delete(folder)
+            # Bulk-delete artifacts, then the resources themselves
+            self.db.query(LearningResourceImage).filter(
+                LearningResourceImage.resource_id.in_(resource_ids)
+            ).delete(synchronize_session=False)
+            self.db.query(FlashCard).filter(
+                FlashCard.resource_id.in_(resource_ids)
+            ).delete(synchronize_session=False)
+            self.db.query(MultipleChoiceQuestion).filter(
+                MultipleChoiceQuestion.resource_id.in_(resource_ids)
+            ).delete(synchronize_session=False)
+            self.db.query(LearningResource).filter(
+                LearningResource.id.in_(resource_ids)
+            ).delete(synchronize_session=False)
+
+        self.db.query(ResourceFolder).filter(
+            ResourceFolder.id.in_(folder_ids)
+        ).delete(synchronize_session=False)
+
+        if resource_ids:
+            # Same counter maintenance as single-resource deletes, batched
+            self.db.query(User).filter(User.id == user_id).update(
+                {
+                    User.resource_count: func.greatest(
+                        func.coalesce(User.resource_count, 0) - len(resource_ids), 0
+                    )
+                },
+                synchronize_session=False,
+            )
         self.db.commit()
 
+        self.delete_s3_files(s3_urls)
+
         return True
 
-    def _recursive_delete_folder_contents(
+    def _build_chat_messages(
         self,
-        folder_id: int,
-        user_id: int
-    ) -> None:
+        resource_id: int,
+        user_id: int,
+        message: str,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> List[Dict[str, str]]:
         """
-        Recursively delete all contents of a folder (subfolders and resources).
+        Build the OpenAI messages array for a resource chat.
 
-        Args:
-            folder_id: ID of the folder whose contents to delete
-            user_id: ID of the current user (for security)
+        Validates ownership and that the resource has chattable content, so
+        both the blocking and streaming chat paths share the same checks.
+
+        Raises:
+            HTTPException: If resource not found or doesn't belong to user
         """
-        # Get all subfolders in this folder
-        subfolders = self.db.query(ResourceFolder).filter(
-            ResourceFolder.parent_folder_id == folder_id,
-            ResourceFolder.user_id == user_id
-        ).all()
+        system_message = None
+
+        # When the prompt cache already holds this resource, a scalar probe
+        # on updated_at both validates ownership and checks the cache
+        # version without pulling the summary notes off the wire
+        cached_prompt = _prompt_cache.get(resource_id)
+        if cached_prompt is not None:
+            updated_at = self.db.query(LearningResource.updated_at).filter(
+                LearningResource.id == resource_id,
+                LearningResource.user_id == user_id
+            ).scalar()
+
+            if updated_at is None:
+                raise HTTPException(status_code=404, detail="Resource not found")
+
+            if cached_prompt[0] == updated_at:
+                system_message = cached_prompt[1]
+                _prompt_cache.move_to_end(resource_id)
+
+        if system_message is None:
+            # Only the title and summary notes feed the prompt, so load just
+            # those columns instead of hydrating the full resource row;
+            # updated_at versions the prompt cache
+            resource = self.db.query(
+                LearningResource.title,
+                LearningResource.summary_notes,
+                LearningResource.updated_at,
+            ).filter(
+                LearningResource.id == resource_id,
+                LearningResource.user_id == user_id
+            ).first()
 
-        # Recursively delete each subfolder
-        for subfolder in subfolders:
-            self._recursive_delete_folder_contents(subfolder.id, user_id)
-            self.db.delete(subfolder)
+            if not resource:
+                raise HTTPException(status_code=404, detail="Resource not found")
 
-        # Get all resources in this folder
-        resources = self.db.query(LearningResource).filter(
-            LearningResource.folder_id == folder_id,
-            LearningResource.user_id == user_id
-        ).all()
+            # Strip the fields once and assemble the context in a single
+            # f-string instead of list-append-join
+            title = (resource.title or "").strip()
+            summary_notes = (resource.summary_notes or "").strip()
 
-        # Delete each resource and its S3 file
-        for resource in resources:
-            # Delete S3 file if it exists and is from our bucket
-            if resource.file_url:
-                self.delete_s3_file(resource.file_url)
+            if not title and not summary_notes:
+                raise HTTPException(
+                    status_code=400,
+                    detail="This resource doesn't have any content to chat about yet. Please wait for processing to complete."
+                )
 
-            # Delete associated resource images and their S3 files
-            resource_images = self.db.query(LearningResourceImage).filter(
-                LearningResourceImage.resource_id == resource.id,
-                LearningResourceImage.user_id == user_id
-            ).all()
+            # Oversized summaries are filtered to the question's most
+            # relevant paragraphs instead of being sent whole every turn.
+            # The filtered prompt depends on the message, so it is built
+            # per-call and kept out of the prompt cache.
+            prompt_is_cacheable = len(summary_notes) <= _SUMMARY_CONTEXT_MAX_CHARS
+            if not prompt_is_cacheable:
+                summary_notes = _select_relevant_summary_chunks(
+                    summary_notes, message
+                )
 
-            for resource_image in resource_images:
-                if resource_image.image_url:
-                    self.delete_s3_file(resource_image.image_url)
+            if title and summary_notes:
+                resource_context = f"Resource Title: {title}\n\nSummary Notes:\n{summary_notes}"
+            elif title:
+                resource_context = f"Resource Title: {title}"
+            else:
+                resource_context = f"Summary Notes:\n{summary_notes}"
+
+            # Fill the static template with the resource context. The
+            # instructions come first and the per-resource context last so
+            # the prompt prefix stays byte-identical across a resource's
+            # chats and OpenAI's prompt caching can hit on it.
+            system_message = CHAT_SYSTEM_PROMPT_TEMPLATE.format(
+                resource_context=resource_context
+            )
 
-            self.db.query(LearningResourceImage).filter(
-                LearningResourceImage.resource_id == resource.id,
-                LearningResourceImage.user_id == user_id
-            ).delete()
+            if prompt_is_cacheable:
+                _prompt_cache[resource_id] = (resource.updated_at, system_message)
+                while len(_prompt_cache) > _PROMPT_CACHE_MAX_ENTRIES:
+                    _prompt_cache.popitem(last=False)
 
-            # Delete associated flash cards
-            self.db.query(FlashCard).filter(
-                FlashCard.resource_id == resource.id,
-                FlashCard.user_id == user_id
-            ).delete()
+        # Keep only the most recent turns; the client sends the full history
+        # on every message
+        if conversation_history:
+            conversation_history = conversation_history[-_CHAT_HISTORY_WINDOW:]
 
-            # Delete associated quiz questions
-            self.db.query(MultipleChoiceQuestion).filter(
-                MultipleChoiceQuestion.resource_id == resource.id,
-                MultipleChoiceQuestion.user_id == user_id
-            ).delete()
+        # Build the messages array for OpenAI in one allocation. History
+        # entries already arrive as {"role", "content"} dicts from the
+        # route, so they are spliced in as-is instead of rebuilt per entry.
+        messages = [
+            {"role": "system", "content": system_message},
+            *(conversation_history or ()),
+            {"role": "user", "content": message},
+        ]
 
-            # Delete the resource itself
-            self.db.delete(resource)
+        return messages
 
-    def chat_with_resource(
+    async def chat_with_resource(
         self,
         resource_id: int,
         user_id: int,
@@ -863,89 +1425,136 @@ class LearningService:
         Raises:
             HTTPException: If resource not found or doesn't belong to user
         """
-        # Query with undefer to explicitly load the transcript field
-        resource = self.db.query(LearningResource).options(
-            undefer(LearningResource.transcript)
-        ).filter(
-            LearningResource.id == resource_id,
-            LearningResource.user_id == user_id
-        ).first()
-
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
+        messages = self._build_chat_messages(
+            resource_id, user_id, message, conversation_history
+        )
 
-        # Build the context from the resource content
-        context_parts = []
+        # Serve repeat opening questions straight from the in-process cache;
+        # follow-ups carry history and are never cached
+        cache_key = None
+        if not conversation_history:
+            cache_key = _chat_cache_key(resource_id, message)
+            cached_response = _chat_cache_get(cache_key)
+            if cached_response is not None:
+                return cached_response
+
+        # Coalesce identical concurrent opening questions: the first request
+        # registers a future, later arrivals just await it
+        if cache_key is not None:
+            inflight = _chat_inflight.get(cache_key)
+            if inflight is not None:
+                return await inflight
+
+        # Bounded concurrency with load shedding: wait briefly for a slot,
+        # otherwise shed the request instead of queueing without bound
+        semaphore = await _acquire_openai_slot()
+
+        future = None
+        if cache_key is not None:
+            future = asyncio.get_running_loop().create_future()
+            _chat_inflight[cache_key] = future
 
-        if resource.title:
-            context_parts.append(f"Resource Title: {resource.title}")
+        try:
+            try:
+                # Get response from OpenAI via the shared pooled client. The
+                # cache key routes every chat for a resource to the same cache
+                # shard so the shared prompt prefix is reused server-side.
+                response = await get_async_openai_client().chat.completions.create(
+                    messages=messages,
+                    prompt_cache_key=f"resource-chat:{resource_id}",
+                    **_select_chat_model(messages),
+                )
 
-        if resource.summary_notes and resource.summary_notes.strip():
-            context_parts.append(f"Summary Notes:\n{resource.summary_notes}")
+                # Extract and return the response message
+                response_message = response.choices[0].message.content
 
-        if not context_parts:
-            raise HTTPException(
-                status_code=400,
-                detail="This resource doesn't have any content to chat about yet. Please wait for processing to complete."
-            )
+                if not response_message or response_message.strip() == "":
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Failed to generate a response. Please try again."
+                    )
 
-        resource_context = "\n\n".join(context_parts)
+                response_message = response_message.strip()
 
-        # Build the system message with resource context
-        system_message = f"""You are a helpful tutor assistant helping a student learn from their study materials.
+                if cache_key is not None:
+                    _chat_cache_put(cache_key, response_message)
 
-Your role is to:
-- Answer questions about the content clearly and accurately
-- Help the student understand difficult concepts
-- Provide examples and clarifications when needed
-- Encourage learning and critical thinking
-- Base your answers on the provided content, but you can also add relevant supplementary information
+                if future is not None:
+                    future.set_result(response_message)
 
-Always be supportive, patient, educational, but brief and succinct in your responses.
+                return response_message
 
-The student has provided you with the following learning resource context from their notes:
+            except Exception as e:
+                logger.error(f"Failed to generate chat response for resource {resource_id}: {e}")
+                http_error = HTTPException(
+                    status_code=500,
+                    detail=f"Failed to generate response: {str(e)}"
+                )
+                if future is not None:
+                    future.set_exception(http_error)
+                    # Mark retrieved in case no request is piggybacking
+                    future.exception()
+                raise http_error
+        finally:
+            semaphore.release()
+            if future is not None:
+                _chat_inflight.pop(cache_key, None)
+
+    async def stream_chat_with_resource(
+        self,
+        resource_id: int,
+        user_id: int,
+        message: str,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response for a learning resource chunk by chunk.
 
-{resource_context}
-"""
+        Ownership and content checks run before the stream starts, so a 404
+        or 400 is still raised as a normal HTTP error. The client sees the
+        first token as soon as OpenAI produces it instead of waiting for the
+        full completion. Streamed responses bypass the response cache.
 
-        # Build the messages array for OpenAI
-        messages = [{"role": "system", "content": system_message}]
+        Raises:
+            HTTPException: If resource not found or doesn't belong to user
+        """
+        messages = self._build_chat_messages(
+            resource_id, user_id, message, conversation_history
+        )
 
-        # Add conversation history if provided
-        if conversation_history:
-            for msg in conversation_history:
-                messages.append({
-                    "role": msg.get("role", "user"),
-                    "content": msg.get("content", "")
-                })
+        # Acquire the concurrency slot here, before the StreamingResponse
+        # sends its 200 headers - a saturated pool then surfaces as a clean
+        # 503 like the non-streaming path, not a truncated stream. The
+        # generator takes ownership and releases when drained or closed.
+        semaphore = await _acquire_openai_slot()
 
-        # Add the current user message
-        messages.append({"role": "user", "content": message})
+        return self._stream_chat_completion(messages, resource_id, semaphore)
 
+    async def _stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        resource_id: int,
+        semaphore: asyncio.Semaphore,
+    ) -> AsyncIterator[str]:
+        # Owns the slot acquired by stream_chat_with_resource and holds it
+        # until the stream is drained, so slow readers still count against
+        # the bound
         try:
-            # Initialize OpenAI client
-            client = OpenAI()
-
-            # Get response from OpenAI
-            response = client.chat.completions.create(
-                model="gpt-5",
+            stream = await get_async_openai_client().chat.completions.create(
                 messages=messages,
+                prompt_cache_key=f"resource-chat:{resource_id}",
+                stream=True,
+                **_select_chat_model(messages),
             )
 
-            # Extract and return the response message
-            response_message = response.choices[0].message.content
-
-            if not response_message or response_message.strip() == "":
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to generate a response. Please try again."
-                )
-
-            return response_message.strip()
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
         except Exception as e:
-            logger.error(f"Failed to generate chat response for resource {resource_id}: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to generate response: {str(e)}"
-            )
\ No newline at end of file
+            # The response has already started, so surface the failure
+            # in-band rather than as an HTTP error
+            logger.error(f"Failed to stream chat response for resource {resource_id}: {e}")
+            yield "\n[Failed to generate response. Please try again.]"
+        finally:
+            semaphore.release()
\ No newline at end of file
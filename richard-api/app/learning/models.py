@@ -1,8 +1,9 @@
 from app.database import Base
 from enum import Enum as PyEnum
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import JSONB
 
 
 class LearningResourceFileType(str, PyEnum):
@@ -23,10 +24,26 @@ class ResourceStatus(str, PyEnum):
 
 class ResourceFolder(Base):
     __tablename__ = "resource_folders"
+    # text_pattern_ops lets LIKE '/1/5/%' prefix scans use the btree, which
+    # is what subtree lookups on materialized_path run
+    __table_args__ = (
+        Index(
+            "ix_resource_folders_materialized_path",
+            "materialized_path",
+            postgresql_ops={"materialized_path": "text_pattern_ops"},
+        ),
+    )
+    # Fetch server defaults (created_at/updated_at) via INSERT ... RETURNING
+    # so creates don't need a refresh SELECT afterwards
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     name = Column(String)
     parent_folder_id = Column(Integer, ForeignKey("resource_folders.id"), nullable=True)
+    # Ancestor chain as "/<root_id>/.../<own_id>/", maintained on create.
+    # Subtree membership becomes a single indexed LIKE prefix match instead
+    # of a query per nesting level.
+    materialized_path = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=False), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=False), server_default=func.now(), onupdate=func.now()
@@ -41,13 +58,27 @@ class ResourceFolder(Base):
 
 class LearningResource(Base):
     __tablename__ = "learning_resources"
+    # Covering index for the (user_id, id) ownership filter every
+    # per-resource endpoint runs
+    __table_args__ = (
+        Index("ix_learning_resources_user_id_id", "user_id", "id"),
+    )
+    # Fetch server defaults via INSERT ... RETURNING, same as ResourceFolder
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     title = Column(String, nullable=True)
     emoji = Column(String, nullable=True)
-    transcript = deferred(Column(String, nullable=True)) # deferred to avoid loading the transcript into memory
+    # Deferred to keep the (potentially huge, TOASTed) transcript out of
+    # ordinary row loads; raiseload turns accidental lazy loads into errors
+    # instead of silent extra SELECTs - readers must undefer explicitly
+    transcript = deferred(Column(Text, nullable=True), raiseload=True)
     summary_notes = Column(String, nullable=True)
     resource_type = Column(String)
+    # Ordered S3 URLs for image resources, denormalized from
+    # learning_resource_images at ingest so resource detail reads don't
+    # need a second query; the image rows remain the source for cleanup
+    image_urls = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
     folder_id = Column(Integer, ForeignKey("resource_folders.id"))
     file_url = Column(String, nullable=True)
     status = Column(String, default=ResourceStatus.PROCESSING.value)
@@ -62,6 +93,11 @@ class LearningResource(Base):
 
 class FlashCard(Base):
     __tablename__ = "flash_cards"
+    # Backs the per-resource lookups and EXISTS probes; Postgres doesn't
+    # index foreign keys on its own
+    __table_args__ = (
+        Index("ix_flash_cards_resource_id", "resource_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     resource_id = Column(Integer, ForeignKey("learning_resources.id"))
@@ -77,11 +113,15 @@ class FlashCard(Base):
 
 class MultipleChoiceQuestion(Base):
     __tablename__ = "multiple_choice_questions"
+    # Same rationale as the flash card index
+    __table_args__ = (
+        Index("ix_multiple_choice_questions_resource_id", "resource_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     resource_id = Column(Integer, ForeignKey("learning_resources.id"))
     question = Column(String)
-    options = Column(String)  # newline separated list of options
+    options = Column(JSONB)  # list of option strings
     correct_option = Column(String)
     created_at = Column(DateTime(timezone=False), server_default=func.now())
     updated_at = Column(
@@ -4,13 +4,15 @@ from fastapi import (
     UploadFile,
     File,
     Form,
-    BackgroundTasks,
     Query,
     HTTPException,
     Request,
+    Response,
 )
-from pydantic import BaseModel
-from typing import Optional, List, Literal, Union, Any
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+import json
+from typing import Optional, List, Dict, Literal, Union, Any, TypedDict
 from datetime import datetime
 from app.auth_dependencies import get_current_user
 from app.users.models import User
@@ -20,18 +22,24 @@ from app.learning.background_tasks.resource_processing.resource_ingestion import
 )
 from app.learning.background_tasks.flash_card_generation import generate_flash_cards
 from app.learning.background_tasks.quiz_generation import generate_quiz_questions
-from app.learning.background_tasks.podcast_generation import generate_podcast
+from app.learning.background_tasks.podcast_generation import generate_podcast_script
 from app.learning.learning_service import LearningService
+from app.task_queue import enqueue
 
 
-router = APIRouter(prefix="/learning", tags=["learning"])
+# ORJSONResponse serializes several times faster than the default json
+# encoder. The hot GET endpoints also omit response_model: their payloads
+# are built from rows we just read out of our own database, so FastAPI's
+# outbound validation pass is pure overhead there.
+router = APIRouter(
+    prefix="/learning", tags=["learning"], default_response_class=ORJSONResponse
+)
 
 
-class CreateResourceRequest(BaseModel):
+class CreateResourceJSON(BaseModel):
     folder_id: int
     resource_type: LearningResourceFileType
-    summary_notes: str = ""
-    file: Optional[UploadFile] = File(None)
+    transcript: str = ""
     file_url: Optional[str] = None
 
 
@@ -49,6 +57,7 @@ class FolderItem(BaseModel):
     resource_type: Optional[LearningResourceFileType] = None  # For resources
     folder_id: Optional[int] = None  # For resources
     file_url: Optional[str] = None  # For resources
+    image_urls: Optional[List[str]] = None  # For resources
     status: Optional[ResourceStatus] = None  # For resources
     created_at: datetime
     updated_at: datetime
@@ -107,6 +116,13 @@ class TranscriptResponse(BaseModel):
     transcript: Optional[str]
 
 
+# Transcripts above this size are streamed in chunks instead of being
+# encoded into one response body; below it the framing overhead isn't
+# worth it
+_TRANSCRIPT_STREAM_MIN_CHARS = 256 * 1024
+_TRANSCRIPT_STREAM_CHUNK_CHARS = 64 * 1024
+
+
 class FlashCardsExistResponse(BaseModel):
     resource_id: int
     has_flash_cards: bool
@@ -127,6 +143,14 @@ class SummaryNotesExistResponse(BaseModel):
     has_summary_notes: bool
 
 
+class ArtifactsExistResponse(BaseModel):
+    resource_id: int
+    has_flash_cards: bool
+    has_quiz_questions: bool
+    has_transcript: bool
+    has_summary_notes: bool
+
+
 class QuizQuestionResponse(BaseModel):
     id: int
     resource_id: int
@@ -137,46 +161,102 @@ class QuizQuestionResponse(BaseModel):
     updated_at: datetime
 
 
-class ChatMessage(BaseModel):
-    role: str  # "user" or "assistant"
+class ChatTurn(TypedDict):
+    role: str
     content: str
 
 
 class ChatRequest(BaseModel):
     message: str
-    conversation_history: List[ChatMessage] = []
+    # pydantic-core validates TypedDicts straight into plain dicts, so
+    # each turn's role/content requirement is enforced at the boundary
+    # (missing keys 422 like the baseline) without building per-turn
+    # model instances just to unwrap them again over long histories
+    conversation_history: List[ChatTurn] = []
+    stream: bool = False  # Stream the response as plain text chunks
 
 
 class ChatResponse(BaseModel):
     message: str
 
 
-@router.get("/folders", response_model=List[FolderResponse])
+def _apply_etag(request: Request, response: Response, etag: str) -> Dict[str, str]:
+    """
+    Short-circuit with 304 when the client's If-None-Match matches,
+    otherwise stamp the ETag so the next poll can revalidate. A 304 skips
+    the endpoint's data query, model construction and JSON encoding.
+
+    The headers are set on the injected sub-response (merged by FastAPI
+    when the handler returns a model) and also returned, because handlers
+    that return a Response directly bypass that merge and must pass them
+    to the response constructor themselves.
+    """
+    if request.headers.get("if-none-match") == etag:
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = headers["Cache-Control"]
+    return headers
+
+
+async def resource_etag(
+    resource_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    learning_service: LearningService = Depends(LearningService),
+):
+    """ETag keyed on the resource row's updated_at (index-backed scalar read)."""
+    version = learning_service.get_resource_version(resource_id, current_user.id)
+    return _apply_etag(request, response, f'W/"{resource_id}-{version}"')
+
+
+async def flash_cards_etag(
+    resource_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    learning_service: LearningService = Depends(LearningService),
+):
+    """ETag keyed on the flash card collection's count and latest updated_at."""
+    version = learning_service.get_flash_cards_version(resource_id, current_user.id)
+    return _apply_etag(request, response, f'W/"{resource_id}-fc-{version}"')
+
+
+async def quiz_questions_etag(
+    resource_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    learning_service: LearningService = Depends(LearningService),
+):
+    """ETag keyed on the quiz question collection's count and latest updated_at."""
+    version = learning_service.get_quiz_questions_version(resource_id, current_user.id)
+    return _apply_etag(request, response, f'W/"{resource_id}-quiz-{version}"')
+
+
+@router.get("/folders")
 async def list_folders(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[int] = Query(None),
     current_user: User = Depends(get_current_user),
     learning_service: LearningService = Depends(LearningService),
 ):
     """
-    List all folders that belong to the current user.
+    List folders that belong to the current user, newest first.
 
-    Returns a list of all folders owned by the authenticated user,
-    ordered by creation date (most recent first).
+    Keyset-paginated: pass the previous page's next_cursor to fetch the
+    next page. next_cursor is null on the last page. FolderResponse
+    documents the item shape.
     """
-    folders = learning_service.list_user_folders(user_id=current_user.id)
+    result = learning_service.list_user_folders(
+        user_id=current_user.id, limit=limit, cursor=cursor
+    )
 
-    return [
-        FolderResponse(
-            id=folder.id,
-            name=folder.name,
-            parent_folder_id=folder.parent_folder_id,
-            created_at=folder.created_at,
-            updated_at=folder.updated_at,
-        )
-        for folder in folders
-    ]
+    return ORJSONResponse(result)
 
 
-@router.get("/folder/{folder_id}", response_model=FolderContentsResponse)
+@router.get("/folder/{folder_id}")
 async def get_folder_contents(
     folder_id: int,
     item_type: Optional[Literal["folder", "resource"]] = Query(
@@ -199,15 +279,11 @@ async def get_folder_contents(
         folder_id=folder_id, user_id=current_user.id, item_type=item_type
     )
 
-    # Convert dictionary items to FolderItem models
-    items = [FolderItem(**item) for item in result["items"]]
-
-    return FolderContentsResponse(
-        folder_id=result["folder_id"],
-        folder_name=result["folder_name"],
-        created_at=result["created_at"],
-        items=items,
-    )
+    # The service already returns JSON-safe dicts (orjson serializes
+    # datetimes natively), so hand them straight to the response instead
+    # of wrapping every item in a model FastAPI would immediately re-walk.
+    # FolderContentsResponse/FolderItem above document the shape.
+    return ORJSONResponse(result)
 
 
 @router.post("/folder", response_model=FolderResponse)
@@ -230,7 +306,7 @@ async def create_folder(
         parent_folder_id=request.parent_folder_id,
     )
 
-    return FolderResponse(
+    return FolderResponse.model_construct(
         id=folder.id,
         name=folder.name,
         parent_folder_id=folder.parent_folder_id,
@@ -269,10 +345,95 @@ async def delete_folder(
     }
 
 
+async def _create_resource_impl(
+    learning_service: LearningService,
+    current_user: User,
+    folder_id: int,
+    resource_type: LearningResourceFileType,
+    transcript: str,
+    file_url: Optional[str] = None,
+    file: Optional[UploadFile] = None,
+    files: Optional[List[UploadFile]] = None,
+):
+    """Create the resource, queue ingestion and build the response body."""
+    resource = await learning_service.create_resource(
+        folder_id=folder_id,
+        user_id=current_user.id,
+        resource_type=resource_type,
+        transcript=transcript,
+        file_url=file_url,
+        file=file,
+        files=files,
+    )
+
+    try:
+        enqueue(ingest_resource, resource.id)
+    except HTTPException:
+        # Queue full: the row is already committed, and nothing would
+        # ever move it out of "processing" if we just told the client to
+        # retry. Mark it failed so it doesn't sit stuck, then surface
+        # the 503.
+        resource.status = ResourceStatus.FAILED.value
+        learning_service.db.commit()
+        raise
+
+    return {
+        "message": f"Resource created by {current_user.email}",
+        "resource_id": resource.id,
+        "user_id": current_user.id,
+    }
+
+
+@router.post("/resources/json")
+async def create_resource_json(
+    body: CreateResourceJSON,
+    learning_service: LearningService = Depends(LearningService),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create a URL- or text-based learning resource (YouTube links, TEXT).
+
+    The typed body lets FastAPI's compiled Pydantic schema parse and
+    validate the request instead of the manual dict handling in the
+    legacy /resources endpoint.
+    """
+    return await _create_resource_impl(
+        learning_service,
+        current_user,
+        folder_id=body.folder_id,
+        resource_type=body.resource_type,
+        transcript=body.transcript,
+        file_url=body.file_url,
+    )
+
+
+@router.post("/resources/upload")
+async def create_resource_upload(
+    learning_service: LearningService = Depends(LearningService),
+    current_user: User = Depends(get_current_user),
+    folder_id: int = Form(...),
+    resource_type: LearningResourceFileType = Form(...),
+    transcript: str = Form(""),
+    file: Optional[UploadFile] = File(None),
+    files: Optional[List[UploadFile]] = File(None),
+):
+    """
+    Create a learning resource from uploaded files (PDF, AUDIO, IMAGE).
+    """
+    return await _create_resource_impl(
+        learning_service,
+        current_user,
+        folder_id=folder_id,
+        resource_type=resource_type,
+        transcript=transcript,
+        file=file,
+        files=files,
+    )
+
+
 @router.post("/resources")
 async def create_resource(
     request: Request,
-    background_tasks: BackgroundTasks,
     learning_service: LearningService = Depends(LearningService),
     current_user: User = Depends(get_current_user),
     folder_id: Optional[int] = Form(None),
@@ -283,64 +444,59 @@ async def create_resource(
     files: Optional[List[UploadFile]] = File(None),
 ):
     """
-    Create a new learning resource
-    Accepts either:
-    - JSON body (for URL-based resources like YouTube links and TEXT resources)
-    - Form data (for file uploads like PDF, AUDIO, IMAGE)
+    Create a new learning resource (legacy combined endpoint).
+
+    Accepts either a JSON body or multipart form data, sniffed from
+    Content-Type. Kept for existing clients; new clients should use
+    /resources/json or /resources/upload, which get typed validation.
     """
     content_type = request.headers.get("content-type", "")
 
     # Handle JSON request
     if "application/json" in content_type:
-        body = await request.json()
-        folder_id = body.get("folder_id")
-        resource_type = LearningResourceFileType(body.get("resource_type"))
-        transcript = body.get("transcript", "")
-        file_url = body.get("file_url")
-        file = None
-        files = None
-
-        if not folder_id or not resource_type:
+        try:
+            body = CreateResourceJSON.model_validate(await request.json())
+        except ValidationError:
+            # Keep the baseline's 400 - a bare ValidationError from a
+            # manual model_validate isn't handled by FastAPI and 500s
             raise HTTPException(
                 status_code=400,
                 detail="folder_id and resource_type are required"
             )
+        return await _create_resource_impl(
+            learning_service,
+            current_user,
+            folder_id=body.folder_id,
+            resource_type=body.resource_type,
+            transcript=body.transcript,
+            file_url=body.file_url,
+        )
 
     # Handle form data request
-    elif "multipart/form-data" in content_type:
+    if "multipart/form-data" in content_type:
         if folder_id is None or resource_type is None:
             raise HTTPException(
                 status_code=400,
                 detail="folder_id and resource_type are required in form data"
             )
-        transcript = transcript or ""
-
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail="Content-Type must be either application/json or multipart/form-data"
+        return await _create_resource_impl(
+            learning_service,
+            current_user,
+            folder_id=folder_id,
+            resource_type=resource_type,
+            transcript=transcript or "",
+            file_url=file_url,
+            file=file,
+            files=files,
         )
 
-    resource = await learning_service.create_resource(
-        folder_id=folder_id,
-        user_id=current_user.id,
-        resource_type=resource_type,
-        transcript=transcript,
-        file_url=file_url,
-        file=file,
-        files=files,
+    raise HTTPException(
+        status_code=400,
+        detail="Content-Type must be either application/json or multipart/form-data"
     )
 
-    background_tasks.add_task(ingest_resource, resource.id)
-
-    return {
-        "message": f"Resource created by {current_user.email}",
-        "resource_id": resource.id,
-        "user_id": current_user.id,
-    }
-
 
-@router.get("/resources/{resource_id}/status", response_model=ResourceStatusResponse)
+@router.get("/resources/{resource_id}/status")
 async def get_resource_status(
     resource_id: int,
     current_user: User = Depends(get_current_user),
@@ -358,7 +514,7 @@ async def get_resource_status(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    return ResourceStatusResponse(
+    return ResourceStatusResponse.model_construct(
         id=resource.id,
         title=resource.title,
         resource_type=resource.resource_type,
@@ -368,7 +524,7 @@ async def get_resource_status(
     )
 
 
-@router.get("/resources/{resource_id}", response_model=ResourceResponse)
+@router.get("/resources/{resource_id}", dependencies=[Depends(resource_etag)])
 async def get_resource(
     resource_id: int,
     current_user: User = Depends(get_current_user),
@@ -384,18 +540,11 @@ async def get_resource(
     Only returns resources that belong to the authenticated user.
     """
 
-    resource = learning_service.get_resource(
+    resource, image_urls = learning_service.get_resource_with_images(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    # Fetch image URLs for image resources
-    image_urls = []
-    if resource.resource_type == LearningResourceFileType.IMAGE:
-        image_urls = learning_service.get_resource_images(
-            resource_id=resource_id, user_id=current_user.id
-        )
-
-    return ResourceResponse(
+    return ResourceResponse.model_construct(
         id=resource.id,
         title=resource.title,
         emoji=resource.emoji,
@@ -410,9 +559,10 @@ async def get_resource(
     )
 
 
-@router.get("/resources/{resource_id}/transcript", response_model=TranscriptResponse)
+@router.get("/resources/{resource_id}/transcript")
 async def get_resource_transcript(
     resource_id: int,
+    etag_headers: Dict[str, str] = Depends(resource_etag),
     current_user: User = Depends(get_current_user),
     learning_service: LearningService = Depends(LearningService),
 ):
@@ -429,14 +579,34 @@ async def get_resource_transcript(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    return TranscriptResponse(resource_id=resource_id, transcript=transcript)
+    if transcript and len(transcript) > _TRANSCRIPT_STREAM_MIN_CHARS:
+        # Multi-MB transcripts: write the JSON body progressively instead
+        # of building a second full-size encoded copy in memory. Each
+        # chunk is string-escaped independently (escaping is
+        # per-character, and str slicing can't split a code point), so
+        # the concatenated stream is the same JSON document as before.
+        def iter_payload():
+            yield f'{{"resource_id":{resource_id},"transcript":"'
+            for i in range(0, len(transcript), _TRANSCRIPT_STREAM_CHUNK_CHARS):
+                chunk = transcript[i:i + _TRANSCRIPT_STREAM_CHUNK_CHARS]
+                yield json.dumps(chunk)[1:-1]
+            yield '"}'
+
+        return StreamingResponse(
+            iter_payload(), media_type="application/json", headers=etag_headers
+        )
 
+    return TranscriptResponse.model_construct(
+        resource_id=resource_id, transcript=transcript
+    )
 
-@router.get(
-    "/resources/{resource_id}/flash-cards", response_model=List[FlashCardResponse]
-)
+
+@router.get("/resources/{resource_id}/flash-cards")
 async def get_flash_cards(
     resource_id: int,
+    etag_headers: Dict[str, str] = Depends(flash_cards_etag),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[int] = Query(None),
     current_user: User = Depends(get_current_user),
     learning_service: LearningService = Depends(LearningService),
 ):
@@ -449,26 +619,51 @@ async def get_flash_cards(
     Only returns flash cards that belong to the authenticated user.
     """
 
-    flash_cards = learning_service.get_flash_cards(
+    # The service returns plain dicts from a column-only select; orjson
+    # encodes them (datetimes included) in one C call with no per-item
+    # model construction. FlashCardResponse above documents the item shape.
+    result = learning_service.get_flash_cards(
+        resource_id=resource_id,
+        user_id=current_user.id,
+        limit=limit,
+        cursor=cursor,
+    )
+
+    return ORJSONResponse(result, headers=etag_headers)
+
+
+# No response_model: this is polled every few seconds per open resource,
+# and the flags were computed by our own query - revalidating them through
+# pydantic per poll is pure overhead. ArtifactsExistResponse documents the
+# shape.
+@router.get("/resources/{resource_id}/artifacts/exists")
+async def check_artifacts_exist(
+    resource_id: int,
+    current_user: User = Depends(get_current_user),
+    learning_service: LearningService = Depends(LearningService),
+):
+    """
+    Check all generated artifacts for a resource in one call.
+
+    - **resource_id**: The ID of the resource to check
+
+    Returns flags for flash cards, quiz questions, transcript and summary
+    notes, computed by a single database query. Prefer this over the four
+    per-artifact /exists endpoints when polling the resource detail page.
+    Only checks resources that belong to the authenticated user.
+    """
+
+    artifacts = learning_service.check_artifacts_exist(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    return [
-        FlashCardResponse(
-            id=card.id,
-            resource_id=card.resource_id,
-            front=card.front,
-            back=card.back,
-            created_at=card.created_at,
-            updated_at=card.updated_at,
-        )
-        for card in flash_cards
-    ]
+    return ORJSONResponse({"resource_id": resource_id, **artifacts})
 
 
 @router.get(
     "/resources/{resource_id}/flash-cards/exists",
     response_model=FlashCardsExistResponse,
+    deprecated=True,
 )
 async def check_flash_cards_exist(
     resource_id: int,
@@ -478,24 +673,29 @@ async def check_flash_cards_exist(
     """
     Check if flash cards exist for a specific learning resource by ID.
 
+    Deprecated: prefer GET /resources/{resource_id}/artifacts/exists,
+    which returns all four artifact flags in a single request.
+
+
     - **resource_id**: The ID of the resource to check for flash cards
 
     Returns a boolean indicating whether the resource has any associated flash cards.
     Only checks resources that belong to the authenticated user.
     """
 
-    has_flash_cards = learning_service.check_flash_cards_exist(
+    artifacts = learning_service.check_artifacts_exist(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    return FlashCardsExistResponse(
-        resource_id=resource_id, has_flash_cards=has_flash_cards
+    return FlashCardsExistResponse.model_construct(
+        resource_id=resource_id, has_flash_cards=artifacts["has_flash_cards"]
     )
 
 
 @router.get(
     "/resources/{resource_id}/quiz-questions/exists",
     response_model=QuizQuestionsExistResponse,
+    deprecated=True,
 )
 async def check_quiz_questions_exist(
     resource_id: int,
@@ -505,23 +705,29 @@ async def check_quiz_questions_exist(
     """
     Check if quiz questions exist for a specific learning resource by ID.
 
+    Deprecated: prefer GET /resources/{resource_id}/artifacts/exists,
+    which returns all four artifact flags in a single request.
+
+
     - **resource_id**: The ID of the resource to check for quiz questions
 
     Returns a boolean indicating whether the resource has any associated quiz questions.
     Only checks resources that belong to the authenticated user.
     """
 
-    has_quiz_questions = learning_service.check_quiz_questions_exist(
+    artifacts = learning_service.check_artifacts_exist(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    return QuizQuestionsExistResponse(
-        resource_id=resource_id, has_quiz_questions=has_quiz_questions
+    return QuizQuestionsExistResponse.model_construct(
+        resource_id=resource_id, has_quiz_questions=artifacts["has_quiz_questions"]
     )
 
 
 @router.get(
-    "/resources/{resource_id}/transcript/exists", response_model=TranscriptExistResponse
+    "/resources/{resource_id}/transcript/exists",
+    response_model=TranscriptExistResponse,
+    deprecated=True,
 )
 async def check_transcript_exists(
     resource_id: int,
@@ -531,24 +737,29 @@ async def check_transcript_exists(
     """
     Check if a transcript exists for a specific learning resource by ID.
 
+    Deprecated: prefer GET /resources/{resource_id}/artifacts/exists,
+    which returns all four artifact flags in a single request.
+
+
     - **resource_id**: The ID of the resource to check for transcript
 
     Returns a boolean indicating whether the resource has an associated transcript.
     Only checks resources that belong to the authenticated user.
     """
 
-    has_transcript = learning_service.check_transcript_exists(
+    artifacts = learning_service.check_artifacts_exist(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    return TranscriptExistResponse(
-        resource_id=resource_id, has_transcript=has_transcript
+    return TranscriptExistResponse.model_construct(
+        resource_id=resource_id, has_transcript=artifacts["has_transcript"]
     )
 
 
 @router.get(
     "/resources/{resource_id}/summary-notes/exists",
     response_model=SummaryNotesExistResponse,
+    deprecated=True,
 )
 async def check_summary_notes_exist(
     resource_id: int,
@@ -558,25 +769,28 @@ async def check_summary_notes_exist(
     """
     Check if summary notes exist for a specific learning resource by ID.
 
+    Deprecated: prefer GET /resources/{resource_id}/artifacts/exists,
+    which returns all four artifact flags in a single request.
+
+
     - **resource_id**: The ID of the resource to check for summary notes
 
     Returns a boolean indicating whether the resource has associated summary notes.
     Only checks resources that belong to the authenticated user.
     """
 
-    has_summary_notes = learning_service.check_summary_notes_exist(
+    artifacts = learning_service.check_artifacts_exist(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    return SummaryNotesExistResponse(
-        resource_id=resource_id, has_summary_notes=has_summary_notes
+    return SummaryNotesExistResponse.model_construct(
+        resource_id=resource_id, has_summary_notes=artifacts["has_summary_notes"]
     )
 
 
 @router.post("/resources/{resource_id}/flash-cards/ai")
 async def generate_flash_cards_for_resource(
     resource_id: int,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     learning_service: LearningService = Depends(LearningService),
 ):
@@ -590,13 +804,14 @@ async def generate_flash_cards_for_resource(
     Only works for resources that belong to the authenticated user.
     """
 
-    # Verify the resource exists and belongs to the user
-    resource = learning_service.get_resource(
+    # Verify the resource exists and belongs to the user (EXISTS probe;
+    # the full row isn't needed to kick off the task)
+    learning_service.verify_resource_ownership(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    # Add background task to generate flash cards
-    background_tasks.add_task(generate_flash_cards, resource_id)
+    # Queue the flash card generation job
+    enqueue(generate_flash_cards, resource_id)
 
     return {
         "message": f"Flash card generation started for resource {resource_id}",
@@ -605,11 +820,12 @@ async def generate_flash_cards_for_resource(
     }
 
 
-@router.get(
-    "/resources/{resource_id}/quiz-questions", response_model=List[QuizQuestionResponse]
-)
+@router.get("/resources/{resource_id}/quiz-questions")
 async def get_quiz_questions(
     resource_id: int,
+    etag_headers: Dict[str, str] = Depends(quiz_questions_etag),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[int] = Query(None),
     current_user: User = Depends(get_current_user),
     learning_service: LearningService = Depends(LearningService),
 ):
@@ -622,30 +838,21 @@ async def get_quiz_questions(
     Only returns quiz questions that belong to the authenticated user.
     """
 
-    quiz_questions = learning_service.get_quiz_questions(
-        resource_id=resource_id, user_id=current_user.id
+    # Same dict pass-through as flash cards; QuizQuestionResponse above
+    # documents the item shape, and options is already a JSON list.
+    result = learning_service.get_quiz_questions(
+        resource_id=resource_id,
+        user_id=current_user.id,
+        limit=limit,
+        cursor=cursor,
     )
 
-    return [
-        QuizQuestionResponse(
-            id=question.id,
-            resource_id=question.resource_id,
-            question=question.question,
-            options=question.options.split(
-                "\n"
-            ),  # Convert newline-separated string back to list
-            correct_option=question.correct_option,
-            created_at=question.created_at,
-            updated_at=question.updated_at,
-        )
-        for question in quiz_questions
-    ]
+    return ORJSONResponse(result, headers=etag_headers)
 
 
 @router.post("/resources/{resource_id}/quiz-questions/ai")
 async def generate_quiz_questions_for_resource(
     resource_id: int,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     learning_service: LearningService = Depends(LearningService),
 ):
@@ -659,13 +866,13 @@ async def generate_quiz_questions_for_resource(
     Only works for resources that belong to the authenticated user.
     """
 
-    # Verify the resource exists and belongs to the user
-    resource = learning_service.get_resource(
+    # Verify the resource exists and belongs to the user (EXISTS probe)
+    learning_service.verify_resource_ownership(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    # Add background task to generate quiz questions
-    background_tasks.add_task(generate_quiz_questions, resource_id)
+    # Queue the quiz generation job
+    enqueue(generate_quiz_questions, resource_id)
 
     return {
         "message": f"Quiz question generation started for resource {resource_id}",
@@ -677,7 +884,6 @@ async def generate_quiz_questions_for_resource(
 @router.post("/resources/{resource_id}/podcast/ai")
 async def generate_podcast_for_resource(
     resource_id: int,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     learning_service: LearningService = Depends(LearningService),
 ):
@@ -691,13 +897,13 @@ async def generate_podcast_for_resource(
     Only works for resources that belong to the authenticated user.
     """
 
-    # Verify the resource exists and belongs to the user
-    resource = learning_service.get_resource(
+    # Verify the resource exists and belongs to the user (EXISTS probe)
+    learning_service.verify_resource_ownership(
         resource_id=resource_id, user_id=current_user.id
     )
 
-    # Add background task to generate podcast
-    background_tasks.add_task(generate_podcast, resource_id)
+    # Queue the podcast script generation job
+    enqueue(generate_podcast_script, resource_id)
 
     return {
         "message": f"Podcast generation started for resource {resource_id}",
@@ -744,7 +950,9 @@ async def manual_create_flash_card(
     Create a new flash card for a specific learning resource by ID.
     """
 
-@router.post("/resources/{resource_id}/chat", response_model=ChatResponse)
+# No response_model: the message came back from the service verbatim,
+# ChatResponse documents the shape
+@router.post("/resources/{resource_id}/chat")
 async def send_resource_chat_message(
     resource_id: int,
     chat_request: ChatRequest,
@@ -757,28 +965,32 @@ async def send_resource_chat_message(
     - **resource_id**: The ID of the resource to chat about
     - **message**: The user's message/question
     - **conversation_history**: Optional list of previous messages in the conversation
+    - **stream**: If true, the response is streamed as plain text chunks so the
+      client sees the first token immediately
 
     Returns an AI-generated response based on the resource's content (summary notes and transcript).
     The conversation context is managed client-side - pass previous messages in conversation_history.
     """
 
-    # Verify the resource exists and belongs to the user
-    resource = learning_service.get_resource(
-        resource_id=resource_id, user_id=current_user.id
-    )
+    # No separate ownership query here: the service's prompt builder
+    # validates ownership on the same SELECT it uses to fetch the chat
+    # context, so a second lookup would just duplicate it
 
-    # Convert Pydantic models to dictionaries for the service layer
-    conversation_history_dicts = [
-        {"role": msg.role, "content": msg.content}
-        for msg in chat_request.conversation_history
-    ]
+    if chat_request.stream:
+        chunks = await learning_service.stream_chat_with_resource(
+            resource_id=resource_id,
+            user_id=current_user.id,
+            message=chat_request.message,
+            conversation_history=chat_request.conversation_history,
+        )
+        return StreamingResponse(chunks, media_type="text/plain; charset=utf-8")
 
     # Get AI response
-    response_message = learning_service.chat_with_resource(
+    response_message = await learning_service.chat_with_resource(
         resource_id=resource_id,
         user_id=current_user.id,
         message=chat_request.message,
-        conversation_history=conversation_history_dicts
+        conversation_history=chat_request.conversation_history
     )
 
-    return ChatResponse(message=response_message)
\ No newline at end of file
+    return ORJSONResponse({"message": response_message})
\ No newline at end of file
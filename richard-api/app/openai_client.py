@@ -0,0 +1,43 @@
+"""Process-wide OpenAI clients.
+
+Constructing an OpenAI client sets up an httpx client, a TLS connection
+pool and a retry policy; doing that per call throws away the pooled
+connections and pays the TLS handshake again on every request. Both
+clients here are created lazily on first use (so importing the app does
+not require OPENAI_API_KEY) and then reused for the life of the process.
+"""
+import httpx
+from openai import AsyncOpenAI, OpenAI
+from typing import Optional
+
+# Generous read timeout for long completions, but fail fast on connect
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_MAX_RETRIES = 2
+_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+_async_client: Optional[AsyncOpenAI] = None
+_sync_client: Optional[OpenAI] = None
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Shared async client for request-path calls (chat endpoints)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(
+            timeout=_TIMEOUT,
+            max_retries=_MAX_RETRIES,
+            http_client=httpx.AsyncClient(limits=_LIMITS),
+        )
+    return _async_client
+
+
+def get_openai_client() -> OpenAI:
+    """Shared sync client for background tasks (transcription, summaries)."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = OpenAI(
+            timeout=_TIMEOUT,
+            max_retries=_MAX_RETRIES,
+            http_client=httpx.Client(limits=_LIMITS),
+        )
+    return _sync_client
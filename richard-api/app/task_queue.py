@@ -0,0 +1,91 @@
+"""In-process queue for long-running background jobs.
+
+FastAPI's BackgroundTasks executes jobs on the serving worker after the
+response is sent, so LLM and transcription jobs competed with live
+requests for the same worker capacity. This module runs them on a small
+dedicated thread pool instead: the pool bounds how many jobs execute at
+once and keeps them off the request path entirely.
+
+A distributed broker (Celery/Dramatiq) would additionally move the work
+off the API box, but this stack has no Redis tier to back one. The
+enqueue() call sites are broker-shaped - function plus arguments - so
+swapping in a real queue later only changes this module. Two broker
+behaviors are reproduced here: transient failures are retried with
+backoff, and enqueue sheds load once the backlog is deep enough that
+new jobs would sit unstarted for minutes.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Jobs are dominated by LLM and S3 round-trips, so a handful of workers
+# is plenty; the bound is what matters - it stops a burst of uploads from
+# spawning unbounded concurrent OpenAI calls
+_MAX_WORKERS = 4
+
+# Back-pressure: beyond this many queued-or-running jobs, reject new
+# enqueues instead of growing the executor's unbounded internal queue.
+# Jobs run minutes each, so a deep backlog means work that would never
+# start in useful time anyway.
+_MAX_PENDING = 64
+
+# Jobs get a few attempts with exponential backoff before being dropped;
+# most failures here are transient upstream errors (OpenAI, S3)
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY_SECONDS = 2.0
+
+_executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="bg-task")
+
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def enqueue(func, *args, **kwargs) -> None:
+    """
+    Run func(*args, **kwargs) on the background pool.
+
+    Raises HTTPException(503) when the backlog is full so callers shed
+    load instead of accepting jobs that would sit queued for minutes.
+    Failed jobs are retried with backoff; final failures are logged
+    rather than raised - the enqueuing request has long since returned,
+    so there is nobody to raise to.
+    """
+    global _pending
+
+    with _pending_lock:
+        if _pending >= _MAX_PENDING:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy processing other tasks. Please try again shortly.",
+            )
+        _pending += 1
+
+    def _run():
+        global _pending
+        try:
+            for attempt in range(1, _MAX_ATTEMPTS + 1):
+                try:
+                    func(*args, **kwargs)
+                    return
+                except Exception:
+                    if attempt == _MAX_ATTEMPTS:
+                        logger.exception(
+                            f"Background task {func.__name__} failed after {attempt} attempts"
+                        )
+                        return
+                    delay = _RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1)
+                    logger.exception(
+                        f"Background task {func.__name__} failed (attempt {attempt}), "
+                        f"retrying in {delay:.0f}s"
+                    )
+                    time.sleep(delay)
+        finally:
+            with _pending_lock:
+                _pending -= 1
+
+    _executor.submit(_run)
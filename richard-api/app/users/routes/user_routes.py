@@ -1,8 +1,12 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.auth_dependencies import get_current_user
+from app.auth_dependencies import get_current_user, invalidate_user_token, security
+from fastapi.security import HTTPAuthorizationCredentials
 from app.users.models import User
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -16,8 +20,10 @@ class UserResponse(BaseModel):
     profile_picture_url: str | None = None
     root_folder_id: int | None = None
     resource_count: int = 0
-    created_at: str | None = None
-    updated_at: str | None = None
+    # datetime, not pre-rendered strings: orjson formats these in C at
+    # encode time, so no Python-level isoformat() per request
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
 
     class Config:
         from_attributes = True
@@ -39,7 +45,9 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
     Requires:
         JWT authentication via Authorization header
     """
-    return UserResponse(
+    # model_construct: the values come straight off our own row, so
+    # pydantic re-validation is wasted CPU on every call
+    return UserResponse.model_construct(
         id=current_user.id,
         email=current_user.email,
         first_name=current_user.first_name,
@@ -47,14 +55,15 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
         profile_picture_url=current_user.profile_picture_url,
         root_folder_id=current_user.root_folder_id,
         resource_count=current_user.resource_count or 0,
-        created_at=current_user.created_at.isoformat() if current_user.created_at else None,
-        updated_at=current_user.updated_at.isoformat() if current_user.updated_at else None
+        created_at=current_user.created_at,
+        updated_at=current_user.updated_at
     )
 
 
 @router.delete("/delete-account")
 async def delete_account(
     current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """
@@ -74,83 +83,86 @@ async def delete_account(
     """
     try:
         # Import here to avoid circular imports
-        from app.learning.models import (
-            ResourceFolder,
-            LearningResource,
-            LearningResourceImage,
-            FlashCard,
-            MultipleChoiceQuestion
-        )
         from app.learning.learning_service import LearningService
 
         user_id = current_user.id
         learning_service = LearningService(db)
 
-        # Delete in order of dependencies (child tables first)
-        # 1. Delete flash cards
-        flash_cards_deleted = db.query(FlashCard).filter(
-            FlashCard.user_id == user_id
-        ).delete()
-
-        # 2. Delete multiple choice questions
-        questions_deleted = db.query(MultipleChoiceQuestion).filter(
-            MultipleChoiceQuestion.user_id == user_id
-        ).delete()
-
-        # 3. Delete resource images and their S3 files
-        resource_images = db.query(LearningResourceImage).filter(
-            LearningResourceImage.user_id == user_id
-        ).all()
-
-        for resource_image in resource_images:
-            if resource_image.image_url:
-                learning_service.delete_s3_file(resource_image.image_url)
-
-        images_deleted = db.query(LearningResourceImage).filter(
-            LearningResourceImage.user_id == user_id
-        ).delete()
-
-        # 4. Delete learning resources and their S3 files
-        resources = db.query(LearningResource).filter(
-            LearningResource.user_id == user_id
-        ).all()
-
-        for resource in resources:
-            if resource.file_url:
-                learning_service.delete_s3_file(resource.file_url)
-
-        resources_deleted = db.query(LearningResource).filter(
-            LearningResource.user_id == user_id
-        ).delete()
-
-        # 5. Set root_folder_id to null to avoid foreign key constraint violation
-        # The users table has a foreign key reference to resource_folders.id via root_folder_id
-        # We must null this field before deleting the folders to prevent constraint violations
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            user.root_folder_id = None
-            db.flush()  # Apply the update before deleting folders
-
-        # 6. Delete resource folders (including nested folders)
-        folders_deleted = db.query(ResourceFolder).filter(
-            ResourceFolder.user_id == user_id
-        ).delete()
-
-        # 7. Finally delete the user
-        user_deleted = db.query(User).filter(User.id == user_id).delete()
-
-        # Commit all deletions
+        # Collect every S3 object the account owns in one round-trip so
+        # the files can be removed after the rows are gone
+        s3_urls = [
+            row[0]
+            for row in db.execute(
+                text(
+                    """
+                    SELECT image_url FROM learning_resource_images
+                    WHERE user_id = :uid AND image_url IS NOT NULL
+                    UNION ALL
+                    SELECT file_url FROM learning_resources
+                    WHERE user_id = :uid AND file_url IS NOT NULL
+                    """
+                ),
+                {"uid": user_id},
+            )
+        ]
+
+        # One statement instead of a delete per table: the CTE chain lets
+        # Postgres run the whole cascade in a single round-trip, and each
+        # branch's RETURNING feeds the per-table counts. Deleting the
+        # folders and the user together is safe - foreign key checks run
+        # at end of statement, by which point the users row referencing
+        # root_folder_id is gone too.
+        counts = db.execute(
+            text(
+                """
+                WITH fc AS (
+                    DELETE FROM flash_cards WHERE user_id = :uid RETURNING 1
+                ), mcq AS (
+                    DELETE FROM multiple_choice_questions
+                    WHERE user_id = :uid RETURNING 1
+                ), img AS (
+                    DELETE FROM learning_resource_images
+                    WHERE user_id = :uid RETURNING 1
+                ), res AS (
+                    DELETE FROM learning_resources
+                    WHERE user_id = :uid RETURNING 1
+                ), fld AS (
+                    DELETE FROM resource_folders
+                    WHERE user_id = :uid RETURNING 1
+                ), usr AS (
+                    DELETE FROM users WHERE id = :uid RETURNING 1
+                )
+                SELECT
+                    (SELECT count(*) FROM fc) AS flash_cards,
+                    (SELECT count(*) FROM mcq) AS quiz_questions,
+                    (SELECT count(*) FROM img) AS resource_images,
+                    (SELECT count(*) FROM res) AS learning_resources,
+                    (SELECT count(*) FROM fld) AS folders,
+                    (SELECT count(*) FROM usr) AS "user"
+                """
+            ),
+            {"uid": user_id},
+        ).one()
+
         db.commit()
 
+        # The auth cache would otherwise keep serving this account for
+        # its TTL after deletion
+        invalidate_user_token(credentials.credentials)
+
+        # S3 cleanup happens after the commit: a failed delete there
+        # shouldn't roll back the account removal
+        learning_service.delete_s3_files(s3_urls)
+
         return {
             "message": "Account successfully deleted",
             "deleted_counts": {
-                "flash_cards": flash_cards_deleted,
-                "quiz_questions": questions_deleted,
-                "resource_images": images_deleted,
-                "learning_resources": resources_deleted,
-                "folders": folders_deleted,
-                "user": user_deleted
+                "flash_cards": counts.flash_cards,
+                "quiz_questions": counts.quiz_questions,
+                "resource_images": counts.resource_images,
+                "learning_resources": counts.learning_resources,
+                "folders": counts.folders,
+                "user": counts.user
             }
         }
 
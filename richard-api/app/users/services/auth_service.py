@@ -1,16 +1,165 @@
 import jwt
 import json
-import requests
+import re
+import time
+import asyncio
+import base64
+import hashlib
+import hmac
+import threading
+import httpx
+from collections import OrderedDict
 from typing import Optional
+from sqlalchemy import bindparam, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
 from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.database import get_db
 from app.users.models import User
 from app.learning.models import ResourceFolder
 from app.settings import settings
 
+# Identity-provider signing keys rotate rarely, so fetched JWKS are
+# cached process-wide with the TTL the provider advertises via
+# Cache-Control (fallback 10 minutes) - without this every sign-in paid
+# a full HTTPS round-trip plus an RSA key parse for keys that are
+# identical for hours at a time.
+_JWKS_DEFAULT_TTL_SECONDS = 600
+_JWKS_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+# Shared client so cache refreshes reuse kept-alive TLS connections to
+# the providers instead of paying a fresh TCP+TLS handshake per refetch.
+# Created lazily (same pattern as app.openai_client), closed on app
+# shutdown.
+_jwks_http: Optional[httpx.AsyncClient] = None
+
+
+def _get_jwks_http() -> httpx.AsyncClient:
+    global _jwks_http
+    if _jwks_http is None:
+        _jwks_http = httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=10),
+        )
+    return _jwks_http
+
+
+async def close_jwks_http() -> None:
+    """Close the shared JWKS client; called from the app shutdown hook."""
+    global _jwks_http
+    if _jwks_http is not None:
+        await _jwks_http.aclose()
+        _jwks_http = None
+
+
+class _JWKSCache:
+    """TTL cache of one provider's JWKS, keyed by kid.
+
+    Values are already-constructed RSA public keys, so hits skip
+    from_jwk too. The hit path is a plain dict lookup; the refresh runs
+    single-flight under an asyncio.Lock, so a cold-start burst of
+    sign-ins produces one fetch, not one per coroutine.
+    """
+
+    def __init__(self, url: str, provider: str):
+        self.url = url
+        self.provider = provider
+        self.keys: dict = {}
+        self.expires_at: float = 0.0
+        self.lock = asyncio.Lock()
+
+    async def get_key(self, key_id: str):
+        """
+        Resolve a kid to its cached public key, refetching on expiry or
+        on an unknown kid (mid-TTL key rotation). Returns None if the
+        provider doesn't publish the kid even after a refresh.
+        """
+        if time.monotonic() < self.expires_at:
+            public_key = self.keys.get(key_id)
+            if public_key is not None:
+                return public_key
+
+        async with self.lock:
+            # Another coroutine may have refreshed while this one waited
+            # on the lock - re-check before fetching again
+            if time.monotonic() < self.expires_at and key_id in self.keys:
+                return self.keys[key_id]
+            await self._refresh()
+        return self.keys.get(key_id)
+
+    async def _refresh(self) -> None:
+        response = await _get_jwks_http().get(self.url)
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Could not fetch {self.provider} keys",
+            )
+
+        ttl = _JWKS_DEFAULT_TTL_SECONDS
+        match = _JWKS_MAX_AGE_PATTERN.search(
+            response.headers.get("cache-control", "")
+        )
+        if match:
+            ttl = int(match.group(1))
+
+        self.keys = {
+            key["kid"]: jwt.algorithms.RSAAlgorithm.from_jwk(key)
+            for key in response.json()["keys"]
+        }
+        self.expires_at = time.monotonic() + ttl
+
+
+_apple_jwks_cache = _JWKSCache("https://appleid.apple.com/auth/keys", "Apple")
+_google_jwks_cache = _JWKSCache("https://www.googleapis.com/oauth2/v3/certs", "Google")
+
+# Decoded-payload cache for our own HS256 tokens. The HMAC verify is
+# cheap but runs on every authenticated request; tokens never change
+# once issued (no exp claim), so the decoded payload can be reused.
+# Keyed by SHA-256 of the token rather than the token itself so the
+# cache never holds usable credentials. Same TTL+LRU OrderedDict shape
+# as the token -> User cache in app.auth_dependencies; verification
+# failures are never cached.
+_JWT_CACHE_TTL_SECONDS = 300
+_JWT_CACHE_MAX_ENTRIES = 10_000
+_jwt_cache: OrderedDict = OrderedDict()
+_jwt_cache_lock = threading.Lock()
+
+# Key material prepared once at import: PyJWT otherwise re-encodes the
+# str secret to bytes (and re-validates it) on every encode/decode call.
+# Runs on every authenticated request, so pay the prep exactly once.
+_JWT_ALGORITHM = "HS256"
+_JWT_ALGORITHMS = [_JWT_ALGORITHM]
+_JWT_KEY = jwt.algorithms.get_default_algorithms()[_JWT_ALGORITHM].prepare_key(
+    settings.jwt_secret_key
+)
+
+# The JOSE header never varies, so its base64 segment is a constant;
+# signing then only has to serialize the payload and HMAC it. Output is
+# byte-identical to jwt.encode(..., algorithm="HS256")
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+# User lookups built once: reusing the same statement object lets
+# SQLAlchemy's compiled-statement cache key on identity, skipping the
+# per-call Query construction and recompile of the legacy API. These run
+# on every sign-in / token-cache miss.
+_USER_BY_GOOGLE_SUB = select(User).where(User.google_sub == bindparam("sub"))
+_USER_BY_APPLE_SUB = select(User).where(User.apple_sub == bindparam("sub"))
+_USER_BY_ID = select(User).where(User.id == bindparam("uid"))
+
+
+def _split_name(full_name: str, given_name: str, family_name: str) -> tuple:
+    """
+    Resolve (first, last) from Google profile fields, preferring the
+    explicit given/family names and falling back to splitting the full
+    name once on the first space.
+    """
+    parts = full_name.split(" ", 1) if full_name else ()
+    first_name = given_name or (parts[0] if parts else "")
+    last_name = family_name or (parts[1] if len(parts) > 1 else "")
+    return first_name, last_name
+
 
 class AuthService:
     def __init__(self, db: Session = Depends(get_db)):
@@ -19,8 +168,31 @@ class AuthService:
     async def verify_google_token(self, token: str) -> dict:
         """Verify Google ID token and return user info"""
         try:
-            # Verify the token
-            idinfo = id_token.verify_oauth2_token(token, google_requests.Request())
+            header = jwt.get_unverified_header(token)
+            key_id = header.get("kid")
+
+            if not key_id:
+                raise HTTPException(status_code=400, detail="No key ID in token")
+
+            # Cached Google cert (fetched at most once per TTL);
+            # verify_oauth2_token refetched the certs on every call
+            # because each fresh Request() has no cache
+            public_key = await _google_jwks_cache.get_key(key_id)
+
+            if not public_key:
+                raise HTTPException(
+                    status_code=400, detail="Could not find matching key"
+                )
+
+            # Verify and decode the token off the event loop. Like the
+            # verify_oauth2_token call this replaces, no audience check
+            idinfo = await run_in_threadpool(
+                jwt.decode,
+                token,
+                public_key,
+                algorithms=["RS256"],
+                options={"verify_aud": False},
+            )
 
             # Check if token is from Google
             if idinfo["iss"] not in [
@@ -45,29 +217,18 @@ class AuthService:
             if not key_id:
                 raise HTTPException(status_code=400, detail="No key ID in token")
 
-            # Get Apple's public keys
-            response = requests.get("https://appleid.apple.com/auth/keys")
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=400, detail="Could not fetch Apple keys"
-                )
-
-            keys = response.json()["keys"]
-
-            # Find the correct key
-            public_key = None
-            for key in keys:
-                if key["kid"] == key_id:
-                    public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
-                    break
+            # Cached Apple public key (fetched at most once per TTL)
+            public_key = await _apple_jwks_cache.get_key(key_id)
 
             if not public_key:
                 raise HTTPException(
                     status_code=400, detail="Could not find matching key"
                 )
 
-            # Verify and decode the token
-            payload = jwt.decode(
+            # Verify and decode the token. The RSA verify is CPU-bound,
+            # so it also runs off the event loop
+            payload = await run_in_threadpool(
+                jwt.decode,
                 identity_token,
                 public_key,
                 algorithms=["RS256"],
@@ -91,7 +252,9 @@ class AuthService:
         email = google_info.get("email")
 
         # Try to find existing user by Google sub ID
-        user = self.db.query(User).filter(User.google_sub == google_sub).first()
+        user = self.db.execute(
+            _USER_BY_GOOGLE_SUB, {"sub": google_sub}
+        ).scalar_one_or_none()
 
         if not user:
             # Extract name from Google info
@@ -100,48 +263,57 @@ class AuthService:
             family_name = google_info.get("family_name", "")
 
             # Use given_name and family_name if available, otherwise parse full_name
-            first_name = given_name or (full_name.split(" ")[0] if full_name else "")
-            last_name = family_name or (
-                " ".join(full_name.split(" ")[1:]) if " " in full_name else ""
-            )
+            first_name, last_name = _split_name(full_name, given_name, family_name)
 
             # Get profile picture URL
             profile_picture_url = google_info.get("picture", "")
 
-            # Create new user with root folder
-            user = self.create_new_user_with_folder(
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-                google_sub=google_sub,
-                profile_picture_url=profile_picture_url
-            )
+            # Create new user with root folder. Concurrent first
+            # sign-ins (mobile retries) can both miss the SELECT above;
+            # the unique index on google_sub turns the loser's INSERT
+            # into an IntegrityError instead of a duplicate row, and we
+            # fall back to the row the winner created
+            try:
+                user = self.create_new_user_with_folder(
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                    google_sub=google_sub,
+                    profile_picture_url=profile_picture_url
+                )
+            except IntegrityError:
+                self.db.rollback()
+                user = self.db.execute(
+                    _USER_BY_GOOGLE_SUB, {"sub": google_sub}
+                ).scalar_one()
         else:
             # Update existing user with name info if not already set
             full_name = google_info.get("name", "")
             given_name = google_info.get("given_name", "")
             family_name = google_info.get("family_name", "")
 
+            dirty = False
+
             # Only update if fields are currently empty
             if not user.first_name and not user.last_name:
-                first_name = given_name or (full_name.split(" ")[0] if full_name else "")
-                last_name = family_name or (
-                    " ".join(full_name.split(" ")[1:]) if " " in full_name else ""
-                )
+                first_name, last_name = _split_name(full_name, given_name, family_name)
 
                 if first_name or last_name:
                     user.first_name = first_name
                     user.last_name = last_name
+                    dirty = True
 
             # Update profile picture if not already set
             if not user.profile_picture_url:
                 profile_picture_url = google_info.get("picture", "")
                 if profile_picture_url:
                     user.profile_picture_url = profile_picture_url
+                    dirty = True
 
-            # Commit any updates
-            self.db.commit()
-            self.db.refresh(user)
+            # Only commit when something actually changed - the common
+            # returning-user sign-in is then a pure read
+            if dirty:
+                self.db.commit()
 
         return user
 
@@ -153,23 +325,31 @@ class AuthService:
         email = apple_info.get("email")
 
         # Try to find existing user by Apple sub ID
-        user = self.db.query(User).filter(User.apple_sub == apple_sub).first()
+        user = self.db.execute(
+            _USER_BY_APPLE_SUB, {"sub": apple_sub}
+        ).scalar_one_or_none()
 
         if not user:
-            # Create new user with root folder
-            user = self.create_new_user_with_folder(
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-                apple_sub=apple_sub
-            )
+            # Create new user with root folder; same duplicate-sign-in
+            # race handling as the Google path
+            try:
+                user = self.create_new_user_with_folder(
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                    apple_sub=apple_sub
+                )
+            except IntegrityError:
+                self.db.rollback()
+                user = self.db.execute(
+                    _USER_BY_APPLE_SUB, {"sub": apple_sub}
+                ).scalar_one()
         else:
             # Update existing user with name info if not already set and if provided
             if not user.first_name and not user.last_name and (first_name or last_name):
                 user.first_name = first_name
                 user.last_name = last_name
                 self.db.commit()
-                self.db.refresh(user)
 
         return user
 
@@ -192,29 +372,34 @@ class AuthService:
             profile_picture_url=profile_picture_url,
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
-        
-        # Create root folder for new user
+        # flush assigns user.id without ending the transaction, so the
+        # user, their root folder and the back-reference all land in a
+        # single commit instead of three
+        self.db.flush()
+
         self.create_root_folder(user)
-        
+        self.db.commit()
+
         return user
 
     def create_root_folder(self, user: User) -> ResourceFolder:
-        """Create a root folder for a new user"""
+        """
+        Create a root folder for a new user. Flushes but does not commit;
+        the caller owns the transaction.
+        """
         root_folder = ResourceFolder(
             user_id=user.id,
             name=f"{user.first_name}'s Notes" if user.first_name else "My Notes",
             parent_folder_id=None
         )
         self.db.add(root_folder)
-        self.db.commit()
-        self.db.refresh(root_folder)
+        self.db.flush()
+
+        # Root folders start their own materialized path chain
+        root_folder.materialized_path = f"/{root_folder.id}/"
 
         # Update user with root folder reference
         user.root_folder_id = root_folder.id
-        self.db.commit()
-        self.db.refresh(user)
 
         return root_folder
 
@@ -228,19 +413,45 @@ class AuthService:
             # Note: No 'exp' field means token doesn't expire
         }
 
-        token = jwt.encode(payload, settings.jwt_secret_key, algorithm="HS256")
-        return token
+        # Manual JWS assembly: the precomputed header segment skips
+        # PyJWT's per-call header build and algorithm lookup; the compact
+        # separators match PyJWT's serialization exactly
+        payload_json = json.dumps(payload, separators=(",", ":")).encode()
+        payload_b64 = base64.urlsafe_b64encode(payload_json).rstrip(b"=")
+        signing_input = _JWT_HEADER_B64 + b"." + payload_b64
+        signature = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+        signature_b64 = base64.urlsafe_b64encode(signature).rstrip(b"=")
+        return (signing_input + b"." + signature_b64).decode("ascii")
 
     def verify_jwt_token(self, token: str) -> dict:
         """Verify JWT token and return payload"""
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        now = time.monotonic()
+
+        with _jwt_cache_lock:
+            entry = _jwt_cache.get(cache_key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    _jwt_cache.move_to_end(cache_key)
+                    return payload
+                del _jwt_cache[cache_key]
+
         try:
-            payload = jwt.decode(token, settings.jwt_secret_key, algorithms=["HS256"])
-            return payload
+            payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired")
         except jwt.InvalidTokenError:
             raise HTTPException(status_code=401, detail="Invalid token")
 
+        with _jwt_cache_lock:
+            _jwt_cache[cache_key] = (now + _JWT_CACHE_TTL_SECONDS, payload)
+            _jwt_cache.move_to_end(cache_key)
+            while len(_jwt_cache) > _JWT_CACHE_MAX_ENTRIES:
+                _jwt_cache.popitem(last=False)
+
+        return payload
+
     def get_user_from_token(self, token: str) -> User:
         """Get user from JWT token"""
         payload = self.verify_jwt_token(token)
@@ -249,7 +460,7 @@ class AuthService:
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token payload")
 
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self.db.execute(_USER_BY_ID, {"uid": user_id}).scalar_one_or_none()
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
 
@@ -258,5 +469,4 @@ class AuthService:
     def create_user(self, user: User):
         self.db.add(user)
         self.db.commit()
-        self.db.refresh(user)
         return user